@@ -7,6 +7,9 @@ from __future__ import annotations
 
 import asyncio
 import concurrent.futures
+import copy
+import threading
+import time
 from typing import Dict, Any, List, Optional, Callable
 from functools import wraps
 from loguru import logger
@@ -21,9 +24,50 @@ from .agents_db import (
     search_recent_issues,
     list_recent_edi_messages_orm
 )
+from .config import settings
 from .escalation_manager import EscalationManager, get_escalation_guidance_text
 
 
+# Seconds a sync tool call waits for its coroutine before giving up
+TOOL_CALL_TIMEOUT = 30
+
+_tool_loop: Optional[asyncio.AbstractEventLoop] = None
+_tool_loop_lock = threading.Lock()
+
+
+def get_tool_loop() -> asyncio.AbstractEventLoop:
+    """Event loop thread that runs every agent tool coroutine.
+
+    The loop lives for the whole process, so the engine and session factory
+    it creates on first use (see db.get_engine) are reused by every tool call
+    and their pooled connections never cross event loops.
+    """
+    global _tool_loop
+    with _tool_loop_lock:
+        if _tool_loop is None or _tool_loop.is_closed():
+            _tool_loop = asyncio.new_event_loop()
+            threading.Thread(target=_tool_loop.run_forever, name="agent-tools-loop", daemon=True).start()
+    return _tool_loop
+
+
+def run_on_tool_loop(coro: Any, timeout: Optional[float] = TOOL_CALL_TIMEOUT) -> Any:
+    """Run ``coro`` on the tool loop and block until it finishes."""
+    loop = get_tool_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Agent tools cannot be called synchronously from the tool loop itself")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
 def sync_wrapper(async_func: Callable) -> Callable:
     """Wrapper to make async functions callable from CrewAI agents."""
     @wraps(async_func)
@@ -32,31 +76,8 @@ def sync_wrapper(async_func: Callable) -> Callable:
         logger.info(f"🛠️ Agent tool invoked: {func_name}({', '.join(str(arg) for arg in args[:2])}{', ...' if len(args) > 2 else ''})")
         
         try:
-            # Check if there's a running event loop
-            try:
-                current_loop = asyncio.get_running_loop()
-                # We're in an async context with a running loop
-                logger.warning(f"   ⚠️ Running loop detected for {func_name}, using asyncio.create_task")
-                
-                # Create a task to run in the existing loop
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, async_func(*args, **kwargs))
-                    result = future.result(timeout=30)  # 30 second timeout
-                    
-            except RuntimeError:
-                # No running loop, this is expected for sync contexts
-                try:
-                    # Try to get existing event loop
-                    loop = asyncio.get_event_loop()
-                    if loop.is_closed():
-                        # Loop is closed, create a new one
-                        asyncio.set_event_loop(asyncio.new_event_loop())
-                        loop = asyncio.get_event_loop()
-                    result = loop.run_until_complete(async_func(*args, **kwargs))
-                except RuntimeError:
-                    # No event loop exists, create and run with asyncio.run()
-                    result = asyncio.run(async_func(*args, **kwargs))
+            # Same loop (and connection pool) for every call, whether or not the caller has a loop running
+            result = run_on_tool_loop(async_func(*args, **kwargs))
             
             if isinstance(result, dict) and "error" in result:
                 logger.warning(f"   ❌ Tool {func_name} returned error: {result['error']}")
@@ -73,11 +94,84 @@ def sync_wrapper(async_func: Callable) -> Callable:
     return wrapper
 
 
+class ToolResultCache:
+    """Request-scoped memo of tool results keyed by tool name and arguments.
+
+    One instance lives on each AgentDatabaseTools, i.e. per incident, so the
+    repeated overview/health lookups the agents make hit the database once.
+    Error results are never cached. The CrewAI court agents are not given
+    tool objects, so a real crew run never goes through this cache; it only
+    serves the mock/simulated run and callers of register_agent_tools.
+    """
+    
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = settings.tool_cache_ttl if ttl is None else ttl
+        self._entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+    
+    @staticmethod
+    def _key(name: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+        return f"{name}:{args!r}:{sorted(kwargs.items())!r}"
+    
+    def wrap(self, name: str, func: Callable) -> Callable:
+        @wraps(func)
+        def cached(*args, **kwargs):
+            if self.ttl <= 0:
+                return func(*args, **kwargs)
+            key = self._key(name, args, kwargs)
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[0] < self.ttl:
+                    self.hits[name] = self.hits.get(name, 0) + 1
+                    logger.info(f"   ♻️ Tool {name} served from incident cache")
+                    return copy.deepcopy(entry[1])
+            result = func(*args, **kwargs)
+            with self._lock:
+                self.misses[name] = self.misses.get(name, 0) + 1
+                if not (isinstance(result, dict) and "error" in result):
+                    self._entries[key] = (now, copy.deepcopy(result))
+            return result
+        return cached
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl,
+                "hits": sum(self.hits.values()),
+                "misses": sum(self.misses.values()),
+                "db_calls_saved": sum(self.hits.values()),
+                "by_tool": {
+                    name: {"hits": self.hits.get(name, 0), "misses": self.misses.get(name, 0)}
+                    for name in sorted(set(self.hits) | set(self.misses))
+                },
+            }
+
+
+# Read-only database tools that are safe to memoize within one incident
+CACHEABLE_TOOLS = (
+    "get_operational_overview",
+    "check_system_health",
+    "search_containers",
+    "analyze_edi_messages",
+    "get_vessel_details",
+    "get_container_details",
+    "search_recent_incidents",
+    "get_recent_edi_activity",
+)
+
+
 class AgentDatabaseTools:
     """Database tools that AI agents can use to retrieve operational information."""
     
-    def __init__(self):
+    def __init__(self, cache_ttl: Optional[float] = None):
         self.escalation_manager = EscalationManager()
+        # Instance attributes shadow the static tools with per-incident memoized versions
+        self.cache = ToolResultCache(cache_ttl)
+        for name in CACHEABLE_TOOLS:
+            setattr(self, name, self.cache.wrap(name, getattr(type(self), name)))
     
     @staticmethod
     @sync_wrapper
@@ -5,13 +5,16 @@ This module provides a bridge between our database tools and CrewAI agents.
 
 from __future__ import annotations
 
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Optional
 from .agent_tools import AgentDatabaseTools
 
 
-def register_agent_tools() -> Dict[str, Callable]:
-    """Register database tools for use by CrewAI agents."""
-    tools = AgentDatabaseTools()
+def register_agent_tools(tools: Optional[AgentDatabaseTools] = None) -> Dict[str, Callable]:
+    """Register database tools for use by CrewAI agents.
+
+    Pass the incident's AgentDatabaseTools so every agent shares its result cache.
+    """
+    tools = tools or AgentDatabaseTools()
     
     return {
         # Operational tools
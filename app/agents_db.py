@@ -1,16 +1,24 @@
 from __future__ import annotations
 
-from typing import Any, List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+import copy
+import time
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc, func, and_, or_, text
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from .config import settings
 from .db import get_session_factory
 from .models import EdiMessage, ApiEvent, Container, Vessel, VesselAdvice, BerthApplication
 from .supabase_client import get_supabase_client
 
 
+# (monotonic time, metrics) of the last health snapshot, see get_system_health_metrics
+_health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
 async def list_recent_edi_messages_orm(limit: int = 10) -> List[Dict[str, Any]]:
 	"""List recent EDI messages using ORM (preferred for consistency with init_orm)."""
 	session_factory = get_session_factory()
@@ -246,11 +254,28 @@ async def get_vessel_by_name_or_imo(
 	"""Get detailed vessel information by name or IMO number."""
 	session_factory = get_session_factory()
 	async with session_factory() as session:
-		query = select(Vessel).options(
-			selectinload(Vessel.containers),
-			selectinload(Vessel.edi_messages),
-			selectinload(Vessel.api_events)
+		# Child counts come from correlated subqueries, so the lookup is one row
+		# no matter how many messages/events the vessel has accumulated
+		since = datetime.utcnow() - timedelta(hours=24)
+		container_count = (
+			select(func.count(Container.container_id))
+			.where(Container.vessel_id == Vessel.vessel_id)
+			.correlate(Vessel)
+			.scalar_subquery()
 		)
+		recent_edi_count = (
+			select(func.count(EdiMessage.edi_id))
+			.where(EdiMessage.vessel_id == Vessel.vessel_id, EdiMessage.sent_at >= since)
+			.correlate(Vessel)
+			.scalar_subquery()
+		)
+		recent_api_count = (
+			select(func.count(ApiEvent.api_id))
+			.where(ApiEvent.vessel_id == Vessel.vessel_id, ApiEvent.event_ts >= since)
+			.correlate(Vessel)
+			.scalar_subquery()
+		)
+		query = select(Vessel, container_count, recent_edi_count, recent_api_count)
 		
 		if vessel_name:
 			query = query.where(Vessel.vessel_name.ilike(f"%{vessel_name}%"))
@@ -259,11 +284,12 @@ async def get_vessel_by_name_or_imo(
 		else:
 			return None
 		
-		result = await session.execute(query)
-		vessel = result.scalars().first()
+		result = await session.execute(query.limit(1))
+		row = result.first()
 		
-		if not vessel:
+		if not row:
 			return None
+		vessel, containers_total, edi_24h, api_24h = row
 		
 		return {
 			"vessel_id": vessel.vessel_id,
@@ -279,9 +305,9 @@ async def get_vessel_by_name_or_imo(
 			"draft_m": float(vessel.draft_m) if vessel.draft_m else None,
 			"last_port": vessel.last_port,
 			"next_port": vessel.next_port,
-			"container_count": len(vessel.containers),
-			"recent_edi_count": len([m for m in vessel.edi_messages if m.sent_at >= datetime.utcnow() - timedelta(hours=24)]),
-			"recent_api_events": len([e for e in vessel.api_events if e.event_ts >= datetime.utcnow() - timedelta(hours=24)])
+			"container_count": containers_total,
+			"recent_edi_count": edi_24h,
+			"recent_api_events": api_24h
 		}
 
 
@@ -289,9 +315,10 @@ async def get_container_operational_status(container_no: str) -> Optional[Dict[s
 	"""Get detailed operational status of a specific container."""
 	session_factory = get_session_factory()
 	async with session_factory() as session:
+		# Vessel comes from the same row via a join rather than a second SELECT
 		query = select(Container).options(
-			selectinload(Container.vessel)
-		).where(Container.cntr_no == container_no)
+			joinedload(Container.vessel)
+		).where(Container.cntr_no == container_no).limit(1)
 		
 		result = await session.execute(query)
 		container = result.scalars().first()
@@ -299,19 +326,23 @@ async def get_container_operational_status(container_no: str) -> Optional[Dict[s
 		if not container:
 			return None
 		
-		# Get related EDI messages
-		edi_query = select(EdiMessage).where(
+		# Get related EDI messages (only the columns reported, bounded by LIMIT)
+		edi_query = select(
+			EdiMessage.message_type, EdiMessage.status, EdiMessage.sent_at, EdiMessage.error_text
+		).where(
 			EdiMessage.container_id == container.container_id
 		).order_by(desc(EdiMessage.sent_at)).limit(5)
 		edi_result = await session.execute(edi_query)
-		edi_messages = edi_result.scalars().all()
+		edi_messages = edi_result.all()
 		
 		# Get related API events
-		api_query = select(ApiEvent).where(
+		api_query = select(
+			ApiEvent.event_type, ApiEvent.source_system, ApiEvent.event_ts, ApiEvent.http_status
+		).where(
 			ApiEvent.container_id == container.container_id
 		).order_by(desc(ApiEvent.event_ts)).limit(5)
 		api_result = await session.execute(api_query)
-		api_events = api_result.scalars().all()
+		api_events = api_result.all()
 		
 		return {
 			"container": {
@@ -353,77 +384,92 @@ async def get_container_operational_status(container_no: str) -> Optional[Dict[s
 		}
 
 
-async def get_system_health_metrics() -> Dict[str, Any]:
-	"""Get overall system health metrics for operational assessment."""
+async def get_system_health_metrics(use_cache: bool = True) -> Dict[str, Any]:
+	"""Get overall system health metrics for operational assessment.
+
+	All counts come from one aggregate statement (one round-trip); the snapshot
+	is then reused for ``settings.health_metrics_ttl`` seconds.
+	"""
+	global _health_cache
+	if use_cache and _health_cache is not None and time.monotonic() - _health_cache[0] < settings.health_metrics_ttl:
+		return copy.deepcopy(_health_cache[1])
+
 	session_factory = get_session_factory()
 	async with session_factory() as session:
 		now = datetime.utcnow()
 		one_hour_ago = now - timedelta(hours=1)
-		one_day_ago = now - timedelta(days=1)
-		
-		# EDI message health
-		edi_last_hour_result = await session.execute(
-			select(func.count(EdiMessage.edi_id))
+
+		# One single-row subquery per table, FILTER splits totals from errors
+		edi = (
+			select(
+				func.count().label("total"),
+				func.count().filter(EdiMessage.status == 'ERROR').label("errors"),
+			)
 			.where(EdiMessage.sent_at >= one_hour_ago)
+			.subquery()
 		)
-		edi_last_hour_count = edi_last_hour_result.scalar()
-		
-		edi_errors_last_hour_result = await session.execute(
-			select(func.count(EdiMessage.edi_id))
-			.where(and_(
-				EdiMessage.sent_at >= one_hour_ago,
-				EdiMessage.status == 'ERROR'
-			))
-		)
-		edi_errors_last_hour_count = edi_errors_last_hour_result.scalar()
-		
-		# API event health
-		api_events_last_hour_result = await session.execute(
-			select(func.count(ApiEvent.api_id))
+		api = (
+			select(
+				func.count().label("total"),
+				func.count().filter(ApiEvent.http_status >= 400).label("errors"),
+			)
 			.where(ApiEvent.event_ts >= one_hour_ago)
+			.subquery()
 		)
-		api_events_last_hour_count = api_events_last_hour_result.scalar()
-		
-		api_errors_last_hour_result = await session.execute(
-			select(func.count(ApiEvent.api_id))
-			.where(and_(
-				ApiEvent.event_ts >= one_hour_ago,
-				ApiEvent.http_status >= 400
-			))
-		)
-		api_errors_last_hour_count = api_errors_last_hour_result.scalar()
-		
-		# Container operation metrics
-		containers_in_operation_result = await session.execute(
-			select(func.count(Container.container_id))
+		containers = (
+			select(func.count().label("in_operation"))
+			.select_from(Container)
 			.where(Container.status.in_(['TRANSHIP', 'IN_YARD', 'ON_VESSEL', 'LOADED']))
+			.subquery()
 		)
-		containers_in_operation_count = containers_in_operation_result.scalar()
-		
-		# Recent vessel advice
-		active_vessel_advice_result = await session.execute(
-			select(func.count(VesselAdvice.vessel_advice_no))
+		advice = (
+			select(func.count().label("active"))
+			.select_from(VesselAdvice)
 			.where(VesselAdvice.effective_end_datetime.is_(None))
+			.subquery()
 		)
-		active_vessel_advice_count = active_vessel_advice_result.scalar()
-		
-		return {
-			"timestamp": now.isoformat(),
-			"edi_health": {
-				"messages_last_hour": edi_last_hour_count,
-				"errors_last_hour": edi_errors_last_hour_count,
-				"error_rate_percent": round((edi_errors_last_hour_count / max(1, edi_last_hour_count)) * 100, 2)
-			},
-			"api_health": {
-				"events_last_hour": api_events_last_hour_count,
-				"errors_last_hour": api_errors_last_hour_count,
-				"error_rate_percent": round((api_errors_last_hour_count / max(1, api_events_last_hour_count)) * 100, 2)
-			},
-			"operations": {
-				"containers_in_operation": containers_in_operation_count,
-				"active_vessel_advice": active_vessel_advice_count
-			}
+		result = await session.execute(
+			select(edi.c.total, edi.c.errors, api.c.total, api.c.errors, containers.c.in_operation, advice.c.active)
+		)
+		(
+			edi_last_hour_count,
+			edi_errors_last_hour_count,
+			api_events_last_hour_count,
+			api_errors_last_hour_count,
+			containers_in_operation_count,
+			active_vessel_advice_count,
+		) = result.one()
+
+	metrics = {
+		"timestamp": now.isoformat(),
+		"edi_health": {
+			"messages_last_hour": edi_last_hour_count,
+			"errors_last_hour": edi_errors_last_hour_count,
+			"error_rate_percent": round((edi_errors_last_hour_count / max(1, edi_last_hour_count)) * 100, 2)
+		},
+		"api_health": {
+			"events_last_hour": api_events_last_hour_count,
+			"errors_last_hour": api_errors_last_hour_count,
+			"error_rate_percent": round((api_errors_last_hour_count / max(1, api_events_last_hour_count)) * 100, 2)
+		},
+		"operations": {
+			"containers_in_operation": containers_in_operation_count,
+			"active_vessel_advice": active_vessel_advice_count
 		}
+	}
+	_health_cache = (time.monotonic(), metrics)
+	return copy.deepcopy(metrics)
+
+
+def _keyword_pattern(keyword: str) -> str:
+	"""ILIKE pattern matching ``keyword`` literally anywhere in the column."""
+	escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+	return f"%{escaped}%"
+
+
+def _matched_keywords(value: Optional[str], keywords: List[str]) -> List[str]:
+	haystack = (value or "").lower()
+	return [kw for kw in keywords if kw.lower() in haystack]
 
 
 async def search_recent_issues(
@@ -432,41 +478,54 @@ async def search_recent_issues(
 	include_edi_errors: bool = True,
 	include_api_errors: bool = True
 ) -> Dict[str, Any]:
-	"""Search for recent issues based on keywords in error messages."""
+	"""Search for recent issues based on keywords in error messages.
+
+	All keywords are matched in one query per source (OR of ILIKE patterns,
+	served by the pg_trgm indexes on ``edi_message.error_text`` and
+	``api_event.payload_json``); each row appears once with every keyword it matched.
+	"""
+	# Deduplicate keywords case-insensitively, keeping the caller's order
+	terms: List[str] = []
+	for kw in keywords:
+		kw = (kw or "").strip()
+		if kw and kw.lower() not in {t.lower() for t in terms}:
+			terms.append(kw)
+
 	session_factory = get_session_factory()
 	async with session_factory() as session:
 		cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
 		issues = []
 		
-		if include_edi_errors:
+		if include_edi_errors and terms:
 			# Search EDI error messages
-			for keyword in keywords:
-				edi_query = select(EdiMessage).where(and_(
-					EdiMessage.sent_at >= cutoff_time,
-					EdiMessage.status == 'ERROR',
-					EdiMessage.error_text.ilike(f"%{keyword}%")
-				)).order_by(desc(EdiMessage.sent_at)).limit(10)
-				
-				edi_result = await session.execute(edi_query)
-				edi_issues = edi_result.scalars().all()
-				
-				for issue in edi_issues:
-					issues.append({
-						"type": "EDI_ERROR",
-						"timestamp": issue.sent_at.isoformat(),
-						"message_type": issue.message_type,
-						"error_text": issue.error_text,
-						"sender": issue.sender,
-						"receiver": issue.receiver,
-						"keyword_matched": keyword
-					})
+			edi_query = select(EdiMessage).where(and_(
+				EdiMessage.sent_at >= cutoff_time,
+				EdiMessage.status == 'ERROR',
+				or_(*[EdiMessage.error_text.ilike(_keyword_pattern(kw), escape="\\") for kw in terms])
+			)).order_by(desc(EdiMessage.sent_at)).limit(10 * len(terms))
+			
+			edi_result = await session.execute(edi_query)
+			edi_issues = edi_result.scalars().all()
+			
+			for issue in edi_issues:
+				matched = _matched_keywords(issue.error_text, terms)
+				issues.append({
+					"type": "EDI_ERROR",
+					"timestamp": issue.sent_at.isoformat(),
+					"message_type": issue.message_type,
+					"error_text": issue.error_text,
+					"sender": issue.sender,
+					"receiver": issue.receiver,
+					"keyword_matched": matched[0] if matched else None,
+					"keywords_matched": matched
+				})
 		
 		if include_api_errors:
-			# Search API errors (HTTP status >= 400)
-			api_query = select(ApiEvent).where(and_(
-				ApiEvent.event_ts >= cutoff_time,
-				ApiEvent.http_status >= 400
-			)).order_by(desc(ApiEvent.event_ts)).limit(20)
+			# Search API errors (HTTP status >= 400), narrowed to the keywords when given
+			conditions = [ApiEvent.event_ts >= cutoff_time, ApiEvent.http_status >= 400]
+			if terms:
+				conditions.append(or_(*[ApiEvent.payload_json.ilike(_keyword_pattern(kw), escape="\\") for kw in terms]))
+			api_query = select(ApiEvent).where(and_(*conditions)).order_by(desc(ApiEvent.event_ts)).limit(20)
 			
 			api_result = await session.execute(api_query)
 			api_issues = api_result.scalars().all()
@@ -478,7 +537,8 @@ async def search_recent_issues(
 					"event_type": issue.event_type,
 					"source_system": issue.source_system,
 					"http_status": issue.http_status,
-					"correlation_id": issue.correlation_id
+					"correlation_id": issue.correlation_id,
+					"keywords_matched": _matched_keywords(issue.payload_json, terms)
 				})
 		
 		# Sort all issues by timestamp (most recent first)
@@ -1,14 +1,39 @@
 """
 Celery tasks for Imperial Court incident processing.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from celery import Task, states
 from loguru import logger
 
 from .celery_config import celery_app
 from .orchestrator import ImperialOrchestrator
+from .run_events import publish_run_event
 
 
-@celery_app.task(bind=True, name="app.celery_tasks.process_incident")
+# One orchestrator per worker process; it holds no per-incident state
+_orchestrator: Optional[ImperialOrchestrator] = None
+
+
+def get_orchestrator() -> ImperialOrchestrator:
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = ImperialOrchestrator()
+    return _orchestrator
+
+
+class IncidentTask(Task):
+    """Publishes a run's terminal event once Celery has stored its outcome."""
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        # Celery calls this after the result backend holds SUCCESS/FAILURE, so an
+        # SSE client that fetches the run on this event sees the final status and result
+        if status == states.SUCCESS:
+            publish_run_event(task_id, "completed", 100, "Completed")
+        elif status == states.FAILURE:
+            publish_run_event(task_id, "failed", None, "Failed", error=str(retval))
+
+
+@celery_app.task(bind=True, base=IncidentTask, name="app.celery_tasks.process_incident")
 def process_incident(self, incident_text: str) -> Dict[str, Any]:
     """
     Process an incident using the Imperial Court orchestrator.
@@ -31,6 +56,7 @@ def process_incident(self, incident_text: str) -> Dict[str, Any]:
                 "progress": 10
             }
         )
+        publish_run_event(self.request.id, "processing", 10, "Initializing Imperial Court orchestrator")
         
         # Create progress callback function
         def progress_callback(progress: int, step: str):
@@ -42,9 +68,11 @@ def process_incident(self, incident_text: str) -> Dict[str, Any]:
                     "progress": progress
                 }
             )
+            # Push the same update to SSE subscribers of this run
+            publish_run_event(self.request.id, "processing", progress, step)
         
-        # Initialize orchestrator
-        orchestrator = ImperialOrchestrator()
+        # Reuse the worker's orchestrator (and, through it, the cached court agents)
+        orchestrator = get_orchestrator()
         
         # Process the incident with progress callbacks
         result = orchestrator.run(incident={"incident_text": incident_text}, progress_callback=progress_callback)
@@ -80,6 +108,5 @@ def process_incident(self, incident_text: str) -> Dict[str, Any]:
                 "current_step": "Failed during processing"
             }
         )
-        
         # Re-raise the exception so Celery marks the task as failed
         raise e
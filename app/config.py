@@ -1,12 +1,23 @@
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
 # Load .env file explicitly
 load_dotenv()
 
+# zero: no pauses; fixed: per-step defaults (or mock_latency_seconds); sampled: recorded profile
+MOCK_LATENCY_MODES = ("zero", "fixed", "sampled")
+
 
 class Settings(BaseSettings):
 	mock_mode: bool = False  # Default to False instead of True
+	# Mock-mode agent latency: "zero" (no pauses), or opt in to "fixed" (per-step defaults or
+	# mock_latency_seconds) or "sampled" (recorded profile) to emulate agent think time
+	mock_latency_mode: str = "zero"
+	mock_latency_seconds: float | None = None
+	# JSON profile of recorded step durations for "sampled" ({"step": [seconds, ...]} or a flat list)
+	mock_latency_profile: str | None = None
+	mock_latency_seed: int | None = None
 	openai_api_key: str | None = None
 	host: str = "0.0.0.0"
 	port: int = 8000
@@ -25,11 +36,46 @@ class Settings(BaseSettings):
 	qdrant_collection: str | None = None
 	# Embedding configuration
 	embed_model: str | None = None
+	# Per-collection budget (seconds) for RAG searches in the orchestrator
+	rag_search_timeout: float = 5.0
+	# Seconds a system health snapshot is reused before the database is queried again
+	health_metrics_ttl: float = 15.0
+	# Seconds agent tool results are reused within one incident (0 disables); mock/simulated runs only,
+	# since the CrewAI agents get the tools as prompt text, not as callable tool objects
+	tool_cache_ttl: float = 120.0
 	# CrewAI configuration
 	crewai_tracing_enabled: bool = False
+	# Run the technical/business/communication phases concurrently (async tasks joined before synthesis)
+	crew_parallel_specialists: bool = True
+	# LLM record/replay layer for the crew: off | cache | record | replay (see app/llm_cache.py)
+	llm_cache_mode: str = "off"
+	llm_cache_path: str = "data/llm_cache.sqlite3"
+	llm_model: str | None = None
+	# Identical incidents (type, severity, payload) within this many seconds share one run; 0 disables
+	incident_dedup_window_seconds: int = 600
+	# Cosine similarity of incident embeddings treated as a near-duplicate; unset disables
+	incident_dedup_similarity: float | None = None
+	# Most incidents accepted by one POST /incident/run/batch
+	incident_batch_max_size: int = 100
 	# Celery configuration
+	# How long a job's hash stays in the Redis job index (refreshed on every update)
+	job_retention_seconds: int = 7 * 24 * 3600
 	celery_broker_url: str | None = None
 
+	@field_validator("mock_latency_mode")
+	@classmethod
+	def _check_mock_latency_mode(cls, value: str) -> str:
+		mode = value.strip().lower()
+		if mode not in MOCK_LATENCY_MODES:
+			raise ValueError(f"Unknown mock latency mode {value!r}; expected one of {', '.join(MOCK_LATENCY_MODES)}")
+		return mode
+
+	@model_validator(mode="after")
+	def _check_mock_latency_profile(self) -> "Settings":
+		if self.mock_latency_mode == "sampled" and not self.mock_latency_profile:
+			raise ValueError("MOCK_LATENCY_MODE=sampled requires MOCK_LATENCY_PROFILE")
+		return self
+
 	class Config:
 		env_prefix = ""
 		case_sensitive = False
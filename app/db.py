@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from typing import AsyncIterator
+import asyncio
 import ssl
+import threading
+import weakref
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
@@ -17,18 +20,34 @@ except Exception:
 	has_certifi = False
 
 
+# asyncpg connections belong to the event loop that opened them, so each loop
+# gets its own engine (and pool); _engine serves callers outside any loop.
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
+_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncEngine]" = weakref.WeakKeyDictionary()
+_session_factories: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, async_sessionmaker[AsyncSession]]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.RLock()
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+	try:
+		return asyncio.get_running_loop()
+	except RuntimeError:
+		return None
 
 
 def reset_engine() -> None:
-	"""Reset the database engine and session factory to avoid prepared statement conflicts."""
+	"""Reset the database engines and session factories to avoid prepared statement conflicts."""
 	global _engine, _session_factory
-	if _engine is not None:
+	with _registry_lock:
+		engines = list(_engines.values()) + ([_engine] if _engine is not None else [])
+		_engines.clear()
+		_session_factories.clear()
+		_engine = None
+		_session_factory = None
+	for engine in engines:
 		# Close existing engine
-		_engine.sync_engine.dispose()
-	_engine = None
-	_session_factory = None
+		engine.sync_engine.dispose()
 
 
 def _build_ssl_context() -> ssl.SSLContext:
@@ -63,51 +82,70 @@ def _to_sqlalchemy_url(url: str) -> str:
 	return f"postgresql+asyncpg://{base}?{parts.query}" if parts.query else f"postgresql+asyncpg://{base}"
 
 
+def _create_engine() -> AsyncEngine:
+	if not settings.supabase_db_url:
+		raise RuntimeError("SUPABASE_DB_URL is not configured")
+	raw_url = settings.supabase_db_url
+
+	if _using_pgbouncer(raw_url):
+		# psycopg async: ensure sslmode=require in URL, no 'ssl' connect_arg
+		url_with_sslmode = _add_query_param(raw_url, "sslmode", "require")
+		sqlalchemy_url = _to_sqlalchemy_url(url_with_sslmode)
+		return create_async_engine(
+			sqlalchemy_url,
+			echo=False,
+			poolclass=NullPool,
+			connect_args={
+				"prepare_threshold": None,  # Disable prepared statements
+			},
+		)
+	else:
+		# asyncpg: remove sslmode from URL (we pass SSL context via connect_args)
+		parts = urlparse(raw_url)
+		pairs = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() != "sslmode"]
+		asyncpg_url = urlunparse((parts.scheme, parts.netloc, parts.path, parts.params, urlencode(pairs), parts.fragment))
+		sqlalchemy_url = _to_sqlalchemy_url(asyncpg_url)
+		ssl_ctx = _build_ssl_context()
+		return create_async_engine(
+			sqlalchemy_url,
+			pool_size=settings.db_pool_size,
+			max_overflow=settings.db_max_overflow,
+			echo=False,
+			connect_args={
+				"ssl": ssl_ctx,
+				"statement_cache_size": 0,
+				"prepared_statement_cache_size": 0,
+			},
+		)
+
+
 def get_engine() -> AsyncEngine:
+	"""Engine for the running event loop (created on first use in that loop)."""
 	global _engine
-	if _engine is None:
-		if not settings.supabase_db_url:
-			raise RuntimeError("SUPABASE_DB_URL is not configured")
-		raw_url = settings.supabase_db_url
-
-		if _using_pgbouncer(raw_url):
-			# psycopg async: ensure sslmode=require in URL, no 'ssl' connect_arg
-			url_with_sslmode = _add_query_param(raw_url, "sslmode", "require")
-			sqlalchemy_url = _to_sqlalchemy_url(url_with_sslmode)
-			_engine = create_async_engine(
-				sqlalchemy_url,
-				echo=False,
-				poolclass=NullPool,
-				connect_args={
-					"prepare_threshold": None,  # Disable prepared statements
-				},
-			)
-		else:
-			# asyncpg: remove sslmode from URL (we pass SSL context via connect_args)
-			parts = urlparse(raw_url)
-			pairs = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() != "sslmode"]
-			asyncpg_url = urlunparse((parts.scheme, parts.netloc, parts.path, parts.params, urlencode(pairs), parts.fragment))
-			sqlalchemy_url = _to_sqlalchemy_url(asyncpg_url)
-			ssl_ctx = _build_ssl_context()
-			_engine = create_async_engine(
-				sqlalchemy_url,
-				pool_size=settings.db_pool_size,
-				max_overflow=settings.db_max_overflow,
-				echo=False,
-				connect_args={
-					"ssl": ssl_ctx,
-					"statement_cache_size": 0,
-					"prepared_statement_cache_size": 0,
-				},
-			)
-	return _engine
+	loop = _running_loop()
+	with _registry_lock:
+		engine = _engines.get(loop) if loop is not None else _engine
+		if engine is None:
+			engine = _create_engine()
+			if loop is None:
+				_engine = engine
+			else:
+				_engines[loop] = engine
+		return engine
 
 
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
 	global _session_factory
-	if _session_factory is None:
-		_session_factory = async_sessionmaker(bind=get_engine(), expire_on_commit=False)
-	return _session_factory
+	loop = _running_loop()
+	with _registry_lock:
+		factory = _session_factories.get(loop) if loop is not None else _session_factory
+		if factory is None:
+			factory = async_sessionmaker(bind=get_engine(), expire_on_commit=False)
+			if loop is None:
+				_session_factory = factory
+			else:
+				_session_factories[loop] = factory
+		return factory
 
 
 async def run_sql_script(sql_text: str) -> None:
@@ -0,0 +1,93 @@
+"""
+Incident fingerprinting so repeated alerts can share one Imperial Court run.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _normalize(value: Any) -> Any:
+    """Case/whitespace-insensitive canonical form of a JSON-like value."""
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {_normalize(str(k)): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def incident_fingerprint(incident_type: str, severity: str, payload: Dict[str, Any]) -> str:
+    """sha256 over the normalized type, severity and canonical JSON of the payload."""
+    canonical = json.dumps(
+        {"type": _normalize(incident_type), "severity": _normalize(severity), "payload": _normalize(payload)},
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IncidentDeduplicator:
+    """Recent fingerprints (and optionally incident embeddings) mapped to their run_id.
+
+    Exact matches are by fingerprint. When ``similarity_threshold`` is set,
+    an incident whose embedding has cosine similarity >= threshold with a
+    recent one is treated as a near-duplicate. Entries expire after
+    ``window_seconds``.
+    """
+
+    def __init__(self, window_seconds: float, similarity_threshold: Optional[float] = None, max_vectors: int = 512):
+        self.window_seconds = window_seconds
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._recent: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._vectors: Deque[Tuple[str, float, np.ndarray]] = deque(maxlen=max_vectors)
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._recent:
+            _, (_, ts) = next(iter(self._recent.items()))
+            if ts >= cutoff:
+                break
+            self._recent.popitem(last=False)
+        while self._vectors and self._vectors[0][1] < cutoff:
+            self._vectors.popleft()
+
+    def candidates(self, fingerprint: str, vector: Optional[List[float]] = None) -> List[Tuple[str, str]]:
+        """(run_id, match) pairs for this incident, best first; match is 'exact' or 'near'."""
+        now = time.time()
+        out: List[Tuple[str, str]] = []
+        with self._lock:
+            self._expire(now)
+            hit = self._recent.get(fingerprint)
+            if hit is not None:
+                out.append((hit[0], "exact"))
+            if vector is not None and self.similarity_threshold is not None and self._vectors:
+                query = _unit(vector)
+                scored = [(float(np.dot(query, vec)), run_id) for run_id, _, vec in self._vectors]
+                for score, run_id in sorted(scored, reverse=True):
+                    if score < self.similarity_threshold:
+                        break
+                    if all(run_id != r for r, _ in out):
+                        out.append((run_id, "near"))
+        return out
+
+    def remember(self, fingerprint: str, run_id: str, vector: Optional[List[float]] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._recent[fingerprint] = (run_id, now)
+            self._recent.move_to_end(fingerprint)
+            if vector is not None and self.similarity_threshold is not None:
+                self._vectors.append((run_id, now, _unit(vector)))
+
+
+def _unit(vector: List[float]) -> np.ndarray:
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    return arr / norm if norm else arr
@@ -1,14 +1,36 @@
 """
 Background job management for Imperial Court incident processing using Celery.
+
+The job index lives in Redis (the Celery broker), so every API replica sees
+the same jobs:
+
+- ``imperial:jobs``: sorted set of run_ids scored by created_at (epoch seconds)
+- ``imperial:job:<run_id>``: hash with the JobInfo fields
+- ``imperial:incident_fp:<fingerprint>``: run_id of a recent identical incident
+- ``imperial:batch:<group_id>``: list of the run_ids of one batch submission
 """
+import base64
+import json
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from loguru import logger
 
-from .celery_config import celery_app
+import redis
+from celery import group
+
+from .celery_config import celery_app, redis_url
+from .config import settings
+from .incident_dedup import IncidentDeduplicator
+
+
+JOB_INDEX_KEY = "imperial:jobs"
+JOB_KEY_PREFIX = "imperial:job:"
+FINGERPRINT_KEY_PREFIX = "imperial:incident_fp:"
+BATCH_KEY_PREFIX = "imperial:batch:"
 
 
 class JobStatus(str, Enum):
@@ -18,6 +40,14 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+@dataclass
+class BatchItem:
+    """One incident of a batch submission: its text and dedup keys."""
+    incident_text: str
+    fingerprint: Optional[str] = None
+    vector: Optional[List[float]] = None
+
+
 @dataclass
 class JobInfo:
     run_id: str
@@ -33,140 +63,520 @@ class JobInfo:
     current_step: Optional[str] = None
 
 
+_DATETIME_FIELDS = ("created_at", "started_at", "completed_at")
+# Hash fields read for listings; the (large) result is only loaded per run
+SUMMARY_FIELDS = ("run_id", "celery_task_id", "status", "created_at", "started_at", "completed_at", "error", "incident_text", "progress", "current_step")
+# States whose record is final; they are never re-read from the result backend
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+
+
+def _job_key(run_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{run_id}"
+
+
+def _to_hash(job_info: JobInfo) -> Dict[str, str]:
+    """Flatten a JobInfo into Redis hash fields (None fields are omitted)."""
+    fields: Dict[str, str] = {"run_id": job_info.run_id, "celery_task_id": job_info.celery_task_id, "status": job_info.status.value}
+    for name in _DATETIME_FIELDS:
+        value = getattr(job_info, name)
+        if value is not None:
+            fields[name] = value.isoformat()
+    if job_info.result is not None:
+        fields["result"] = json.dumps(job_info.result, default=str)
+    for name in ("error", "incident_text", "current_step"):
+        value = getattr(job_info, name)
+        if value is not None:
+            fields[name] = value
+    if job_info.progress is not None:
+        fields["progress"] = str(job_info.progress)
+    return fields
+
+
+def _from_hash(fields: Dict[str, str]) -> JobInfo:
+    return JobInfo(
+        run_id=fields["run_id"],
+        celery_task_id=fields.get("celery_task_id", fields["run_id"]),
+        status=JobStatus(fields.get("status", JobStatus.QUEUED.value)),
+        created_at=datetime.fromisoformat(fields["created_at"]),
+        started_at=datetime.fromisoformat(fields["started_at"]) if fields.get("started_at") else None,
+        completed_at=datetime.fromisoformat(fields["completed_at"]) if fields.get("completed_at") else None,
+        result=json.loads(fields["result"]) if fields.get("result") else None,
+        error=fields.get("error"),
+        incident_text=fields.get("incident_text"),
+        progress=int(fields["progress"]) if fields.get("progress") else None,
+        current_step=fields.get("current_step"),
+    )
+
+
+def _epoch(value: datetime) -> float:
+    """Index score of a datetime; naive values are taken as UTC like the stored timestamps."""
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def encode_cursor(score: float, run_id: str) -> str:
+    """Opaque page token: the index position (created_at score, run_id) of the last job returned."""
+    return base64.urlsafe_b64encode(f"{score!r}|{run_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        score, run_id = raw.split("|", 1)
+        return float(score), run_id
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def _apply_task_state(job_info: JobInfo, state: str, info: Any) -> None:
+    """Fold a Celery task state (and its info/result payload) into ``job_info``."""
+    if state == "PENDING":
+        job_info.status = JobStatus.QUEUED
+    elif state == "PROCESSING":
+        job_info.status = JobStatus.PROCESSING
+        if not job_info.started_at:
+            job_info.started_at = datetime.now(timezone.utc)
+
+        # Update progress info if available
+        if info and isinstance(info, dict):
+            job_info.progress = info.get("progress")
+            job_info.current_step = info.get("current_step")
+
+    elif state == "SUCCESS":
+        job_info.status = JobStatus.COMPLETED
+        if not job_info.completed_at:
+            job_info.completed_at = datetime.now(timezone.utc)
+
+        # Set progress to 100% for completed jobs
+        job_info.progress = 100
+        job_info.current_step = "Completed"
+
+        # Get the result
+        if isinstance(info, dict) and "result" in info:
+            job_info.result = info["result"]
+
+    elif state == "FAILURE":
+        job_info.status = JobStatus.FAILED
+        if not job_info.completed_at:
+            job_info.completed_at = datetime.now(timezone.utc)
+
+        # Keep the last progress value and update step to indicate failure
+        job_info.current_step = "Failed"
+
+        # Get error information
+        if info and isinstance(info, dict):
+            job_info.error = info.get("error", str(info))
+        else:
+            job_info.error = str(info) if info else "Unknown error"
+
+
 class CeleryJobManager:
-    """Manages background jobs for incident processing using Celery."""
-    
-    def __init__(self):
-        # In-memory job store to persist jobs across requests
-        # This survives until the server restarts
-        self._jobs: Dict[str, JobInfo] = {}
-        self._job_order: List[str] = []  # Track submission order
-    
-    def submit_job(self, incident_text: str) -> str:
-        """Submit a new job and return the task ID as run_id."""
-        # Submit task to Celery
-        from .celery_tasks import process_incident
-        celery_task = process_incident.delay(incident_text)
-        
-        # Use Celery task ID as run_id to avoid reload issues
-        run_id = celery_task.id
-        
-        # Store job info in memory
-        job_info = JobInfo(
+    """Manages background jobs for incident processing using Celery, indexed in Redis."""
+
+    def __init__(self, redis_client: Optional["redis.Redis"] = None):
+        self._redis = redis_client or redis.Redis.from_url(redis_url, decode_responses=True)
+        # Near-duplicate vectors stay per process; exact fingerprints are shared via Redis
+        self._dedup = IncidentDeduplicator(
+            window_seconds=settings.incident_dedup_window_seconds,
+            similarity_threshold=settings.incident_dedup_similarity,
+        )
+
+    def _save(self, job_info: JobInfo, pipe: Optional[Any] = None) -> None:
+        """Write a job's hash and index entry in one MULTI/EXEC transaction."""
+        own = pipe is None
+        pipe = pipe if pipe is not None else self._redis.pipeline(transaction=True)
+        key = _job_key(job_info.run_id)
+        pipe.hset(key, mapping=_to_hash(job_info))
+        pipe.expire(key, settings.job_retention_seconds)
+        pipe.zadd(JOB_INDEX_KEY, {job_info.run_id: job_info.created_at.timestamp()})
+        if own:
+            pipe.execute()
+
+    def _load(self, run_id: str) -> Optional[JobInfo]:
+        fields = self._redis.hgetall(_job_key(run_id))
+        return _from_hash(fields) if fields else None
+
+    def find_duplicate(self, fingerprint: str, vector: Optional[List[float]] = None) -> Optional[Tuple[str, str]]:
+        """Return (run_id, match) of a queued/running/completed run for the same incident within the window."""
+        if settings.incident_dedup_window_seconds <= 0:
+            return None
+        candidates: List[Tuple[str, str]] = []
+        exact = self._redis.get(f"{FINGERPRINT_KEY_PREFIX}{fingerprint}")
+        if exact:
+            candidates.append((exact, "exact"))
+        candidates.extend(c for c in self._dedup.candidates(fingerprint, vector) if c[0] != exact)
+        for run_id, match in candidates:
+            job_info = self.get_job_status(run_id)
+            # A failed run should not swallow a retry of the same alert
+            if job_info and job_info.status != JobStatus.FAILED:
+                return run_id, match
+        return None
+
+    def _claim_fingerprint(self, fingerprint: str, run_id: str) -> Optional[str]:
+        """Atomically make ``run_id`` the run for ``fingerprint`` over the dedup window.
+
+        Returns None once claimed, or the run_id of the live run that already
+        holds the fingerprint. SET NX makes concurrent submissions of one
+        incident (on any replica) agree on a single run; a failed holder is
+        replaced under WATCH so a retry of its alert gets a fresh run.
+        """
+        key = f"{FINGERPRINT_KEY_PREFIX}{fingerprint}"
+        window = settings.incident_dedup_window_seconds
+        for _ in range(5):
+            if self._redis.set(key, run_id, nx=True, ex=window):
+                return None
+            with self._redis.pipeline(transaction=True) as pipe:
+                try:
+                    pipe.watch(key)
+                    holder = pipe.get(key)
+                    if holder is None:
+                        # Expired between SET NX and GET; try the claim again
+                        continue
+                    job_info = self.get_job_status(holder)
+                    if job_info and job_info.status != JobStatus.FAILED:
+                        return holder
+                    pipe.multi()
+                    pipe.set(key, run_id, ex=window)
+                    pipe.execute()
+                    return None
+                except redis.WatchError:
+                    continue
+        # Heavy contention on one fingerprint: attach to whoever holds it now
+        return self._redis.get(key)
+
+    def _attach_or_claim(self, fingerprint: str, vector: Optional[List[float]], run_id: str) -> Optional[Tuple[str, str]]:
+        """(run_id, match) of the run this incident duplicates, or None after claiming it for ``run_id``."""
+        duplicate = self.find_duplicate(fingerprint, vector)
+        if duplicate or settings.incident_dedup_window_seconds <= 0:
+            return duplicate
+        holder = self._claim_fingerprint(fingerprint, run_id)
+        return (holder, "exact") if holder else None
+
+    def _release_fingerprint(self, fingerprint: str, run_id: str) -> None:
+        key = f"{FINGERPRINT_KEY_PREFIX}{fingerprint}"
+        if self._redis.get(key) == run_id:
+            self._redis.delete(key)
+
+    def _new_job(self, run_id: str, incident_text: str) -> JobInfo:
+        return JobInfo(
             run_id=run_id,
             celery_task_id=run_id,
             status=JobStatus.QUEUED,
             created_at=datetime.now(timezone.utc),
             incident_text=incident_text[:200] + "..." if len(incident_text) > 200 else incident_text
         )
-        
-        self._jobs[run_id] = job_info
-        self._job_order.insert(0, run_id)  # Add to front (newest first)
-        
-        logger.info(f"📋 Job submitted and stored in memory - Run ID: {run_id}")
-        logger.info(f"📊 Total jobs in memory: {len(self._jobs)}")
-        
-        return run_id
-    
+
+    def _index_new_job(self, pipe: Any, job_info: JobInfo, fingerprint: Optional[str]) -> None:
+        self._save(job_info, pipe)
+        if fingerprint and settings.incident_dedup_window_seconds > 0:
+            pipe.set(f"{FINGERPRINT_KEY_PREFIX}{fingerprint}", job_info.run_id, ex=settings.incident_dedup_window_seconds)
+
+    def _unindex(self, run_ids: List[str], fingerprints: List[Tuple[str, str]]) -> None:
+        """Undo the indexing of runs whose tasks could not be published."""
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zrem(JOB_INDEX_KEY, *run_ids)
+        pipe.delete(*[_job_key(r) for r in run_ids])
+        pipe.execute()
+        for fingerprint, run_id in fingerprints:
+            self._release_fingerprint(fingerprint, run_id)
+
+    def submit_job(self, incident_text: str, fingerprint: Optional[str] = None, vector: Optional[List[float]] = None) -> str:
+        """Index and enqueue a job unconditionally; returns its run_id."""
+        return self._submit(incident_text, fingerprint, vector, dedup=False)[0]
+
+    def submit_or_attach(self, incident_text: str, fingerprint: str, vector: Optional[List[float]] = None) -> Tuple[str, Optional[str]]:
+        """Enqueue a job unless it repeats a recent incident; returns (run_id, duplicate_match).
+
+        ``duplicate_match`` is None for a new run, else 'exact' or 'near' when
+        the incident was attached to the live run that already covers it.
+        """
+        return self._submit(incident_text, fingerprint, vector, dedup=True)
+
+    def _submit(
+        self,
+        incident_text: str,
+        fingerprint: Optional[str],
+        vector: Optional[List[float]],
+        dedup: bool,
+    ) -> Tuple[str, Optional[str]]:
+        """The job is indexed before its task is published, so every enqueued run is in the index."""
+        from .celery_tasks import process_incident
+
+        # Pre-generated task id, so the fingerprint can be claimed and the job indexed before publishing
+        run_id = str(uuid.uuid4())
+        claimed = False
+        if dedup and fingerprint:
+            duplicate = self._attach_or_claim(fingerprint, vector, run_id)
+            if duplicate:
+                return duplicate
+            claimed = settings.incident_dedup_window_seconds > 0
+
+        job_info = self._new_job(run_id, incident_text)
+
+        pipe = self._redis.pipeline(transaction=True)
+        self._index_new_job(pipe, job_info, None if claimed else fingerprint)
+        pipe.zremrangebyscore(JOB_INDEX_KEY, "-inf", time.time() - settings.job_retention_seconds)
+        pipe.execute()
+        try:
+            process_incident.apply_async(args=[incident_text], task_id=run_id)
+        except Exception:
+            self._unindex([run_id], [(fingerprint, run_id)] if fingerprint else [])
+            raise
+        if fingerprint:
+            self._dedup.remember(fingerprint, run_id, vector)
+
+        logger.info(f"📋 Job indexed in Redis and submitted - Run ID: {run_id}")
+
+        return run_id, None
+
+    def submit_batch(self, items: List[BatchItem], dedup: bool = True) -> Tuple[str, List[Tuple[str, Optional[str]]]]:
+        """Submit incidents together as one Celery group; returns (group_id, [(run_id, duplicate_match)]).
+
+        ``duplicate_match`` is None for an enqueued incident, else 'exact' or
+        'near' when it was attached to a recent run (or to an identical
+        incident earlier in the same batch). New jobs and the batch's run_id
+        list are indexed in one transaction before the group is published.
+        """
+        from .celery_tasks import process_incident
+
+        # A zero window disables dedup, including between identical incidents of this batch
+        dedup = dedup and settings.incident_dedup_window_seconds > 0
+        runs: List[Optional[Tuple[str, Optional[str]]]] = [None] * len(items)
+        pending: List[int] = []
+        claimed: List[Tuple[str, str]] = []
+        first_in_batch: Dict[str, int] = {}
+        for i, item in enumerate(items):
+            run_id = str(uuid.uuid4())
+            if dedup and item.fingerprint:
+                if item.fingerprint in first_in_batch:
+                    continue
+                first_in_batch[item.fingerprint] = i
+                duplicate = self._attach_or_claim(item.fingerprint, item.vector, run_id)
+                if duplicate:
+                    runs[i] = duplicate
+                    continue
+                claimed.append((item.fingerprint, run_id))
+            runs[i] = (run_id, None)
+            pending.append(i)
+        for i, item in enumerate(items):
+            if runs[i] is None:
+                # Repeat of an earlier incident in this batch
+                runs[i] = (runs[first_in_batch[item.fingerprint]][0], "exact")
+
+        group_id = str(uuid.uuid4())
+        pipe = self._redis.pipeline(transaction=True)
+        for i in pending:
+            self._index_new_job(pipe, self._new_job(runs[i][0], items[i].incident_text), None if dedup else items[i].fingerprint)
+        batch_key = f"{BATCH_KEY_PREFIX}{group_id}"
+        pipe.rpush(batch_key, *[run_id for run_id, _ in runs])
+        pipe.expire(batch_key, settings.job_retention_seconds)
+        pipe.zremrangebyscore(JOB_INDEX_KEY, "-inf", time.time() - settings.job_retention_seconds)
+        pipe.execute()
+
+        if pending:
+            try:
+                # One publish pass over a single producer connection instead of a delay() per incident
+                group(
+                    process_incident.s(items[i].incident_text).set(task_id=runs[i][0]) for i in pending
+                ).apply_async(task_id=group_id)
+            except Exception:
+                self._unindex([runs[i][0] for i in pending], claimed)
+                self._redis.delete(batch_key)
+                raise
+        for i in pending:
+            if items[i].fingerprint:
+                self._dedup.remember(items[i].fingerprint, runs[i][0], items[i].vector)
+
+        logger.info(f"📦 Batch {group_id} submitted: {len(pending)} enqueued, {len(items) - len(pending)} attached to existing runs")
+
+        return group_id, runs
+
+    def get_batch(self, group_id: str) -> Optional[List[JobInfo]]:
+        """Summaries of a batch's distinct runs with refreshed status, or None for an unknown group."""
+        run_ids = self._redis.lrange(f"{BATCH_KEY_PREFIX}{group_id}", 0, -1)
+        if not run_ids:
+            return None
+        jobs = self._load_summaries(list(dict.fromkeys(run_ids)))
+        self._refresh_quietly(jobs)
+        return jobs
+
+    def _fetch_task_states(self, run_ids: List[str]) -> Dict[str, Tuple[str, Any]]:
+        """(state, info) for each task in one round-trip: MGET on the celery-task-meta-* keys.
+
+        Falls back to one AsyncResult per task when the result backend is not
+        a key-value store.
+        """
+        backend = celery_app.backend
+        if not hasattr(backend, "get_key_for_task"):
+            return {run_id: (r.state, r.info) for run_id, r in ((i, celery_app.AsyncResult(i)) for i in run_ids)}
+        keys = [backend.get_key_for_task(run_id).decode() for run_id in run_ids]
+        states: Dict[str, Tuple[str, Any]] = {}
+        for run_id, raw in zip(run_ids, self._redis.mget(keys) if keys else []):
+            if raw is None:
+                # No meta stored yet: Celery reports unknown tasks as PENDING
+                states[run_id] = ("PENDING", None)
+            else:
+                # decode_result also rebuilds exceptions, so info matches AsyncResult.info
+                meta = backend.decode_result(raw)
+                states[run_id] = (meta["status"], meta.get("result"))
+        return states
+
+    def refresh_jobs(self, jobs: List[JobInfo]) -> None:
+        """Refresh non-terminal jobs from the result backend and write them back in one transaction."""
+        active = [job for job in jobs if job.status not in TERMINAL_STATUSES]
+        if not active:
+            return
+        states = self._fetch_task_states([job.run_id for job in active])
+        pipe = self._redis.pipeline(transaction=True)
+        for job in active:
+            state, info = states[job.run_id]
+            logger.debug(f"🔍 Celery task {job.run_id} state: {state}")
+            _apply_task_state(job, state, info)
+            self._save(job, pipe)
+        pipe.execute()
+
     def get_job_status(self, run_id: str) -> Optional[JobInfo]:
-        """Get job status and update in-memory store with latest info from Celery."""
+        """Get job status and update the Redis index with latest info from Celery.
+
+        Returns None for an id that is neither indexed nor known to the result
+        backend; ids outside the index are never written into it.
+        """
+        job_info = None
         try:
-            # Get task status from Celery using run_id as task_id
-            celery_task = celery_app.AsyncResult(run_id)
-            
-            logger.debug(f"🔍 Celery task state: {celery_task.state}")
-            logger.debug(f"🔍 Celery task info: {celery_task.info}")
-            
-            # Get existing job info from memory or create new one
-            job_info = self._jobs.get(run_id)
+            job_info = self._load(run_id)
             if not job_info:
-                # Job not in memory (maybe from before server restart)
+                # Not indexed (expired from the index, or not a run at all): report it only if Celery knows it
+                state, info = self._fetch_task_states([run_id])[run_id]
+                if state == "PENDING":
+                    return None
                 job_info = JobInfo(
                     run_id=run_id,
                     celery_task_id=run_id,
                     status=JobStatus.QUEUED,
                     created_at=datetime.now(timezone.utc)
                 )
-                self._jobs[run_id] = job_info
-                if run_id not in self._job_order:
-                    self._job_order.append(run_id)
-            
-            # Update status based on Celery task state
-            if celery_task.state == "PENDING":
-                job_info.status = JobStatus.QUEUED
-            elif celery_task.state == "PROCESSING":
-                job_info.status = JobStatus.PROCESSING
-                if not job_info.started_at:
-                    job_info.started_at = datetime.now(timezone.utc)
-                
-                # Update progress info if available
-                if celery_task.info and isinstance(celery_task.info, dict):
-                    job_info.progress = celery_task.info.get("progress")
-                    job_info.current_step = celery_task.info.get("current_step")
-                    
-            elif celery_task.state == "SUCCESS":
-                job_info.status = JobStatus.COMPLETED
-                if not job_info.completed_at:
-                    job_info.completed_at = datetime.now(timezone.utc)
-                
-                # Set progress to 100% for completed jobs
-                job_info.progress = 100
-                job_info.current_step = "Completed"
-                
-                # Get the result
-                task_result = celery_task.result
-                if isinstance(task_result, dict) and "result" in task_result:
-                    job_info.result = task_result["result"]
-                    
-            elif celery_task.state == "FAILURE":
-                job_info.status = JobStatus.FAILED
-                if not job_info.completed_at:
-                    job_info.completed_at = datetime.now(timezone.utc)
-                
-                # Keep the last progress value and update step to indicate failure
-                job_info.current_step = "Failed"
-                
-                # Get error information
-                if celery_task.info and isinstance(celery_task.info, dict):
-                    job_info.error = celery_task.info.get("error", str(celery_task.info))
-                else:
-                    job_info.error = str(celery_task.info) if celery_task.info else "Unknown error"
-            
-            # Update the job in memory
-            self._jobs[run_id] = job_info
-            
+                _apply_task_state(job_info, state, info)
+                return job_info
+
+            self.refresh_jobs([job_info])
+
             return job_info
-            
+
         except Exception as e:
             logger.error(f"Error getting job status for {run_id}: {e}")
-            # Return existing job info if available, even if Celery query failed
-            return self._jobs.get(run_id)
-    
+            # Return the indexed job info if available, even if Celery query failed
+            return job_info
+
+    def _load_summaries(self, run_ids: List[str]) -> List[JobInfo]:
+        """Summary fields of ``run_ids`` in one pipelined HMGET batch; expired entries are pruned from the index."""
+        pipe = self._redis.pipeline(transaction=False)
+        for run_id in run_ids:
+            pipe.hmget(_job_key(run_id), SUMMARY_FIELDS)
+        jobs: List[JobInfo] = []
+        expired: List[str] = []
+        for run_id, values in zip(run_ids, pipe.execute() if run_ids else []):
+            fields = {name: value for name, value in zip(SUMMARY_FIELDS, values) if value is not None}
+            if fields:
+                jobs.append(_from_hash(fields))
+            else:
+                expired.append(run_id)
+        if expired:
+            # Hash expired under the retention TTL; drop the dangling index entries
+            self._redis.zrem(JOB_INDEX_KEY, *expired)
+        return jobs
+
+    def _refresh_quietly(self, jobs: List[JobInfo]) -> None:
+        try:
+            self.refresh_jobs(jobs)
+        except Exception as e:
+            # Serve the indexed state rather than failing the listing
+            logger.error(f"Bulk job status refresh failed: {e}")
+
     def list_jobs(self, limit: int = 50) -> Dict[str, JobInfo]:
-        """List jobs from memory and update their status by polling Celery."""
-        logger.info(f"📋 Listing jobs from memory (limit: {limit})")
-        
-        # Update status of all jobs by polling Celery (but don't overwrite memory on errors)
-        updated_jobs = {}
-        for run_id in self._job_order[:limit]:  # Respect limit
-            if run_id in self._jobs:
-                # Get fresh status from Celery (this updates memory)
-                fresh_job_info = self.get_job_status(run_id)
-                if fresh_job_info:
-                    updated_jobs[run_id] = fresh_job_info
-                else:
-                    # If Celery query failed, use what we have in memory
-                    updated_jobs[run_id] = self._jobs[run_id]
-        
-        logger.info(f"📊 Returning {len(updated_jobs)} jobs (total in memory: {len(self._jobs)})")
-        
-        return updated_jobs
-    
-    def cleanup_old_jobs(self, max_age_hours: int = 24):
-        """Clean up old completed/failed jobs."""
-        # Note: Celery handles task cleanup automatically based on result_expires setting
-        # No manual cleanup needed when using Celery task IDs directly
-        logger.info("Celery handles automatic task cleanup based on result_expires setting")
+        """List the newest jobs from the Redis index, refreshing their status in bulk.
+
+        A constant number of round-trips regardless of ``limit``: ZREVRANGE, one
+        pipelined HMGET batch, one MGET of task meta and one write-back
+        transaction. Completed/failed jobs are not re-read from the backend.
+        Jobs carry summary fields only; ``result`` is left unset.
+        """
+        logger.info(f"📋 Listing jobs from Redis index (limit: {limit})")
+
+        run_ids = self._redis.zrevrange(JOB_INDEX_KEY, 0, max(0, limit - 1)) if limit > 0 else []
+        jobs = self._load_summaries(run_ids)
+        self._refresh_quietly(jobs)
+
+        logger.info(f"📊 Returning {len(jobs)} jobs (total indexed: {self.count_jobs()})")
+
+        return {job.run_id: job for job in jobs}
+
+    def page_jobs(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        statuses: Optional[List[JobStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        max_scan: int = 1000,
+    ) -> Tuple[List[JobInfo], Optional[str]]:
+        """One page of job summaries, newest first, and the cursor of the next page (None at the end).
+
+        Walks the index with ZREVRANGEBYSCORE from the cursor position, so pages
+        stay stable while new jobs arrive. Status filters apply to the refreshed
+        status; a sparse filter stops after ``max_scan`` index entries and
+        returns a short page with a cursor to continue from.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        upper = _epoch(created_before) if created_before else float("inf")
+        lower = _epoch(created_after) if created_after else "-inf"
+        wanted = set(statuses or ())
+        batch = limit if not wanted else max(limit * 4, 50)
+
+        page: List[JobInfo] = []
+        scanned = 0
+        exhausted = False
+        while not exhausted and len(page) < limit and scanned < max_scan:
+            top = min(upper, position[0]) if position else upper
+            entries = self._redis.zrevrangebyscore(JOB_INDEX_KEY, top, lower, start=0, num=batch, withscores=True)
+            exhausted = len(entries) < batch
+            if position:
+                # The score bound is inclusive: skip the cursor entry and its ties already served
+                entries = [(r, sc) for r, sc in entries if sc < position[0] or r < position[1]]
+            if not entries:
+                exhausted = True
+                break
+            scanned += len(entries)
+            scores = dict(entries)
+            jobs = self._load_summaries([r for r, _ in entries])
+            self._refresh_quietly(jobs)
+            for job in jobs:
+                if not wanted or job.status in wanted:
+                    page.append(job)
+                    if len(page) == limit:
+                        position = (scores[job.run_id], job.run_id)
+                        # Entries after this one in the batch (or beyond it) remain
+                        exhausted = exhausted and job is jobs[-1]
+                        break
+            else:
+                position = (entries[-1][1], entries[-1][0])
+
+        next_cursor = None if exhausted or position is None else encode_cursor(*position)
+        return page, next_cursor
+
+    def count_jobs(self) -> int:
+        return int(self._redis.zcard(JOB_INDEX_KEY))
+
+    def cleanup_old_jobs(self, max_age_hours: int = 24) -> int:
+        """Remove jobs created more than ``max_age_hours`` ago from the index; returns how many."""
+        cutoff = time.time() - max_age_hours * 3600
+        run_ids = self._redis.zrangebyscore(JOB_INDEX_KEY, "-inf", cutoff)
+        if not run_ids:
+            return 0
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zrem(JOB_INDEX_KEY, *run_ids)
+        pipe.delete(*[_job_key(r) for r in run_ids])
+        pipe.execute()
+        logger.info(f"🧹 Removed {len(run_ids)} jobs older than {max_age_hours}h from the index")
+        return len(run_ids)
 
 
 # Global job manager instance
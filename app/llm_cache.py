@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+
+from .config import settings
+
+try:
+	from crewai import LLM as CrewLLM
+	crewai_llm_available = True
+except Exception:
+	crewai_llm_available = False
+
+
+# off: no layer; cache: serve exact repeats from disk, call + store on miss;
+# record: always call and (re)store; replay: serve from disk only, a miss is an error
+LLM_CACHE_MODES = ("off", "cache", "record", "replay")
+
+
+class LLMReplayMiss(RuntimeError):
+	"""Raised in replay mode when a prompt was never recorded."""
+
+
+def prompt_key(model: str, messages: Any, **params: Any) -> str:
+	"""Content address of an LLM call: sha256 over model, messages and call parameters."""
+	payload = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True, default=str, ensure_ascii=False)
+	return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCallStats:
+	"""Hits, misses and recordings of one crew run; the store's own counters are process-wide."""
+
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		self.recorded = 0
+
+	def count(self, field: str) -> None:
+		with self._lock:
+			setattr(self, field, getattr(self, field) + 1)
+
+	def as_dict(self) -> Dict[str, int]:
+		with self._lock:
+			return {"hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+
+class LLMResponseStore:
+	"""SQLite store of LLM responses keyed by prompt_key, shared by record/replay/cache modes."""
+
+	def __init__(self, path: str) -> None:
+		self.path = path
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		self.recorded = 0
+		os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+		self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+		self._db.execute("PRAGMA journal_mode=WAL")
+		self._db.execute(
+			"CREATE TABLE IF NOT EXISTS llm_response ("
+			" key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL,"
+			" latency_ms INTEGER NOT NULL, created_at REAL NOT NULL)"
+		)
+
+	def get(self, key: str) -> Optional[str]:
+		with self._lock:
+			row = self._db.execute("SELECT response FROM llm_response WHERE key = ?", (key,)).fetchone()
+			if row is None:
+				self.misses += 1
+				return None
+			self.hits += 1
+			return row[0]
+
+	def put(self, key: str, model: str, response: str, latency_ms: int) -> None:
+		with self._lock:
+			self._db.execute(
+				"INSERT OR REPLACE INTO llm_response (key, model, response, latency_ms, created_at) VALUES (?, ?, ?, ?, ?)",
+				(key, model, response, latency_ms, time.time()),
+			)
+			self.recorded += 1
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			row = self._db.execute("SELECT COUNT(*), COALESCE(SUM(latency_ms), 0) FROM llm_response").fetchone()
+			return {
+				"hits": self.hits,
+				"misses": self.misses,
+				"recorded": self.recorded,
+				"stored_responses": row[0],
+				"stored_latency_ms": row[1],
+			}
+
+
+_store: Optional[LLMResponseStore] = None
+_store_lock = threading.Lock()
+
+
+def llm_cache_mode() -> str:
+	mode = (settings.llm_cache_mode or "off").lower()
+	if mode not in LLM_CACHE_MODES:
+		raise ValueError(f"Unknown LLM cache mode {mode!r}; expected one of {', '.join(LLM_CACHE_MODES)}")
+	return mode
+
+
+def get_llm_store() -> LLMResponseStore:
+	global _store
+	if _store is None:
+		with _store_lock:
+			if _store is None:
+				_store = LLMResponseStore(settings.llm_cache_path)
+	return _store
+
+
+if crewai_llm_available:
+
+	class RecordingLLM(CrewLLM):
+		"""CrewAI LLM that records responses and serves them back per the LLM cache mode.
+
+		Only plain-text completions are stored; tool-call responses always go
+		to the provider (and are never served from disk).
+
+		Court agents are cached per worker thread, so each instance serves one
+		run at a time; ``begin_run`` gives that run its own call counters.
+		"""
+
+		run_stats: Optional[LLMCallStats] = None
+
+		def begin_run(self) -> LLMCallStats:
+			self.run_stats = LLMCallStats()
+			return self.run_stats
+
+		def _count(self, field: str) -> None:
+			if self.run_stats is not None:
+				self.run_stats.count(field)
+
+		def call(self, messages: Any, tools: Any = None, *args: Any, **kwargs: Any) -> Any:
+			mode = llm_cache_mode()
+			if mode == "off":
+				return super().call(messages, tools, *args, **kwargs)
+			store = get_llm_store()
+			key = prompt_key(self.model, messages, tools=tools, temperature=getattr(self, "temperature", None), stop=getattr(self, "stop", None))
+			if mode in ("cache", "replay"):
+				cached = store.get(key)
+				self._count("misses" if cached is None else "hits")
+				if cached is not None:
+					logger.debug(f"♻️ LLM response served from {mode} store ({key[:12]})")
+					return cached
+				if mode == "replay":
+					raise LLMReplayMiss(f"No recorded response for prompt {key[:12]} (model {self.model})")
+			started = time.perf_counter()
+			response = super().call(messages, tools, *args, **kwargs)
+			if isinstance(response, str):
+				store.put(key, self.model, response, int((time.perf_counter() - started) * 1000))
+				self._count("recorded")
+			return response
+
+
+def get_court_llm() -> Optional[Any]:
+	"""LLM for the court agents when the cache layer is on; None keeps CrewAI's default LLM."""
+	if llm_cache_mode() == "off" or not crewai_llm_available:
+		return None
+	return RecordingLLM(model=settings.llm_model or os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini"))
@@ -4,10 +4,17 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column, relationship
-from sqlalchemy import BigInteger, Integer, String, Text, DateTime, Date, Numeric, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, Integer, String, Text, DateTime, Date, Numeric, ForeignKey, UniqueConstraint, Index, DDL, event
 
 Base = declarative_base()
 
+# Trigram GIN indexes below back the ILIKE keyword searches in agents_db.search_recent_issues
+event.listen(
+	Base.metadata,
+	"before_create",
+	DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 
 class Vessel(Base):
 	__tablename__ = "vessel"
@@ -79,6 +86,10 @@ class EdiMessage(Base):
 	vessel = relationship("Vessel", back_populates="edi_messages")
 	container = relationship("Container")
 
+	__table_args__ = (
+		Index("ix_edi_message_error_text_trgm", "error_text", postgresql_using="gin", postgresql_ops={"error_text": "gin_trgm_ops"}),
+	)
+
 
 class ApiEvent(Base):
 	__tablename__ = "api_event"
@@ -96,6 +107,10 @@ class ApiEvent(Base):
 
 	vessel = relationship("Vessel", back_populates="api_events")
 
+	__table_args__ = (
+		Index("ix_api_event_payload_json_trgm", "payload_json", postgresql_using="gin", postgresql_ops={"payload_json": "gin_trgm_ops"}),
+	)
+
 
 class VesselAdvice(Base):
 	__tablename__ = "vessel_advice"
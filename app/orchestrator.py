@@ -1,5 +1,8 @@
+import concurrent.futures
 import os
-from typing import Dict, Any, List
+import threading
+import time
+from typing import Dict, Any, List, Tuple
 
 from loguru import logger
 
@@ -13,287 +16,40 @@ from .agents import AGENTS
 from .agents_db import list_recent_edi_messages
 from .agent_tools import AgentDatabaseTools, get_tool_guidance_text
 from .config import settings
+from .llm_cache import LLMReplayMiss, get_court_llm, llm_cache_mode
+from .simulation import get_simulation_engine
 
 
-class ImperialOrchestrator:
-	def __init__(self) -> None:
-		# Use config settings instead of direct environment variable access
-		self.mock_mode = settings.mock_mode
-		self.crewai_available = external_available and not self.mock_mode
-		
-		logger.info(f"🔧 Orchestrator initialized - Mock Mode: {self.mock_mode}, CrewAI Available: {self.crewai_available}")
-		logger.info(f"🔧 External Available: {external_available}, Settings Mock Mode: {settings.mock_mode}")
+# Shared pool for fanning RAG searches out across collections
+_RAG_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-search")
 
-	def _search_collection(self, query_text: str, collection: str, top_k: int = 3) -> List[Dict[str, Any]]:
-		"""Search specific Qdrant collection for RAG context."""
-		try:
-			logger.debug(f"🔍 Searching {collection} collection for: '{query_text[:50]}{'...' if len(query_text) > 50 else ''}'")
-			from .rag_embeddings import embed_texts
-			from .rag_qdrant import QdrantStore
-			
-			vec = embed_texts([query_text])[0]
-			store = QdrantStore(collection=collection)
-			
-			hits = store.search(vector=vec, top_k=top_k)
-			logger.debug(f"   📊 Found {len(hits)} results in {collection}")
-			return hits
-		except Exception as e:
-			logger.warning(f"RAG search failed for collection {collection}: {e}")
-			return []
 
-	def _gather_rag_context(self, incident_text: str) -> Dict[str, Any]:
-		"""Gather RAG context from case history and knowledge base collections."""
-		case_history = self._search_collection(incident_text, "imperial_court_case_history", top_k=3)
-		knowledge_base = self._search_collection(incident_text, "imperial_court_knowledge_base", top_k=3)
-		
-		return {
-			"case_history": case_history,
-			"knowledge_base": knowledge_base,
-			"case_history_summary": "\n".join([f"- {doc.get('text', '')[:200]}..." for doc in case_history]),
-			"knowledge_base_summary": "\n".join([f"- {doc.get('text', '')[:200]}..." for doc in knowledge_base])
-		}
+# Per-thread cache of constructed CrewAI agents, see get_court_agents
+_court_agents = threading.local()
 
-	def run(self, incident: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
-		incident_text = incident.get("incident_text", "")
-		if not incident_text:
-			return {"error": "No incident text provided"}
-		
-		logger.info("🏛️ IMPERIAL COURT INCIDENT PROCESSING INITIATED")
-		logger.info(f"📋 Incident Text: {incident_text[:100]}{'...' if len(incident_text) > 100 else ''}")
-		
-		if progress_callback:
-			progress_callback(15, "Gathering RAG context from historical cases...")
-		
-		# Gather RAG context first
-		logger.info("🔍 Gathering RAG context from historical cases and knowledge base...")
-		rag_context = self._gather_rag_context(incident_text)
-		logger.info(f"📚 RAG Context Retrieved - Cases: {len(rag_context.get('case_history', []))}, KB: {len(rag_context.get('knowledge_base', []))}")
-		
-		if progress_callback:
-			progress_callback(25, "RAG context gathered, preparing agent workflow...")
-		
-		# Add RAG context to incident data for agents
-		enhanced_incident = {
-			**incident,
-			"rag_context": rag_context
-		}
-		
-		if not self.crewai_available:
-			logger.info("🎭 Running in MOCK_MODE; returning synthesized results")
-			return self._mock_run(enhanced_incident, progress_callback)
-		
-		logger.info("🤖 Initiating CrewAI Agent Workflow...")
-		return self._crewai_run(enhanced_incident, progress_callback)
 
-	def _mock_run(self, incident: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
-		incident_text = incident.get("incident_text", "")
-		rag_context = incident.get("rag_context", {})
-		
-		logger.info("🎭 MOCK MODE AGENT SIMULATION INITIATED")
-		
-		if progress_callback:
-			progress_callback(30, "Initializing Imperial Court agents...")
-		
-		import time
-		time.sleep(2)  # Simulate initialization time - increased for visibility
-		
-		# Enhanced mock mode with database tool simulation
-		tools = AgentDatabaseTools()
-		
-		if progress_callback:
-			progress_callback(40, "Agent 太和智君 (Emperor) analyzing incident...")
-		
-		# Simulate agent using database tools for analysis
-		logger.info("📊 Simulating agent database tool usage...")
-		db_analysis = {}
-		try:
-			# Simulate operational overview check
-			logger.info("   🔍 Agent retrieving operational overview...")
-			operational_data = tools.get_operational_overview()
-			db_analysis["operational_overview"] = operational_data
-			logger.info(f"   ✅ Operational data retrieved: {operational_data.get('total_vessels', 'N/A')} vessels")
-			
-			time.sleep(2)  # Simulate processing time - increased for visibility
-			if progress_callback:
-				progress_callback(50, "Agent 智文 (Grand Secretariat Strategy) reviewing data...")
-			
-			# Simulate system health check
-			logger.info("   🏥 Agent checking system health...")
-			health_data = tools.check_system_health()
-			db_analysis["system_health"] = health_data
-			if "edi_health" in health_data:
-				edi_rate = health_data["edi_health"].get("error_rate_percent", 0)
-				logger.info(f"   ✅ System health retrieved: {edi_rate}% EDI error rate")
-			else:
-				logger.info("   ⚠️ System health data not available")
-			
-			# Look for keywords in incident for targeted searches
-			text_lower = incident_text.lower()
-			if any(word in text_lower for word in ["container", "cntr", "msku", "oolu", "temu", "cmau"]):
-				if progress_callback:
-					progress_callback(60, "Agent 行吏 (Ministry Personnel) searching container details...")
-				logger.info("   📦 Agent detected container-related incident, searching containers...")
-				# Extract potential container number
-				words = incident_text.split()
-				for word in words:
-					if len(word) >= 10 and any(prefix in word.upper() for prefix in ["MSKU", "OOLU", "TEMU", "CMAU"]):
-						logger.info(f"   🔍 Agent searching for container: {word.upper()}")
-						container_data = tools.get_container_details(word.upper())
-						if container_data:
-							db_analysis["container_details"] = container_data
-							logger.info(f"   ✅ Container details retrieved for {word.upper()}")
-						break
-			
-			time.sleep(2)  # Simulate processing time - increased for visibility
-			if progress_callback:
-				progress_callback(70, "Agent 明鏡 (Grand Secretariat Review) analyzing EDI messages...")
-			
-			if any(word in text_lower for word in ["edi", "message", "coparn", "coarri", "codeco"]):
-				logger.info("   📡 Agent detected EDI-related incident, analyzing messages...")
-				edi_data = tools.analyze_edi_messages(hours_back=12, limit=10)
-				db_analysis["edi_analysis"] = edi_data
-				if "total_messages" in edi_data:
-					logger.info(f"   ✅ EDI analysis completed: {edi_data['total_messages']} messages analyzed")
-				
-		except Exception as e:
-			logger.warning(f"Mock database analysis failed: {e}")
-		
-		# Enhanced incident classification based on database insights
-		time.sleep(2)  # Simulate processing time - increased for visibility
-		if progress_callback:
-			progress_callback(80, "Agent 公衡 (Censorate Chief) classifying incident severity...")
-		
-		logger.info("🧠 Agent analyzing incident type and severity...")
-		incident_type = "General"
-		severity = "Medium"
-		
-		text_lower = incident_text.lower()
-		if "email" in text_lower or "alr-" in text_lower:
-			incident_type = "Email System"
-		elif "container" in text_lower or "duplicate" in text_lower:
-			incident_type = "Container Management"
-		elif "portnet" in text_lower:
-			incident_type = "PORTNET System"
-		elif "edi" in text_lower:
-			incident_type = "EDI Communication"
-		
-		logger.info(f"   📋 Incident classified as: {incident_type}")
-		
-		# Severity assessment considering system health
-		if "urgent" in text_lower or "critical" in text_lower:
-			severity = "High"
-		elif "low" in text_lower or "minor" in text_lower:
-			severity = "Low"
-		else:
-			# Check system health for dynamic severity assessment
-			health = db_analysis.get("system_health", {})
-			edi_health = health.get("edi_health", {})
-			api_health = health.get("api_health", {})
-			
-			if (edi_health.get("error_rate_percent", 0) > 10 or 
-				api_health.get("error_rate_percent", 0) > 10):
-				severity = "High"  # System already stressed
-				logger.info("   ⚠️ Severity elevated to HIGH due to system stress")
-		
-		logger.info(f"   ⚖️ Severity assessed as: {severity}")
-		
-		# Agent decision simulation
-		time.sleep(1)  # Simulate processing time
-		if progress_callback:
-			progress_callback(85, "All agents formulating strategic response...")
-		
-		logger.info("🎯 Agents formulating strategic response...")
-		strategy = f"智文 analyzes {incident_type} incident with severity {severity} using database insights"
-		review = f"明鏡 reviews policy for {incident_type} incidents using knowledge base and operational data"
-		decision = f"太和智君 decides on resource allocation for {severity} priority incident based on system health"
-		
-		logger.info(f"   📝 Strategic Analysis (智文): {strategy}")
-		logger.info(f"   🔍 Policy Review (明鏡): {review}")
-		logger.info(f"   👑 Imperial Decision (太和智君): {decision}")
-		
-		time.sleep(2)  # Simulate processing time - increased for visibility
-		if progress_callback:
-			progress_callback(90, "Agent 察信 (Censorate Field) generating escalation summary...")
-		
-		try:
-			recent = list_recent_edi_messages(5)
-			recent_edi = [{"message_type": r.get("message_type"), "sent_at": r.get("sent_at")} for r in recent]
-		except Exception:
-			recent_edi = []
-		
-		logger.info("✅ MOCK MODE AGENT PROCESSING COMPLETED")
-		
-		# Generate escalation summary in mock mode
-		logger.info("🎫 Generating escalation summary with contact information...")
-		escalation_result = tools.generate_escalation_summary(
-			{"incident_analysis": {
-				"incident_type": incident_type,
-				"severity": severity,
-				"original_text": incident_text,
-				"database_insights_used": list(db_analysis.keys())
-			}},
-			db_analysis,
-			f"Strategic analysis: {strategy}. Review: {review}. Decision: {decision}"
-		)
-		
-		if "error" not in escalation_result:
-			logger.info(f"   ✅ Escalation summary generated: {escalation_result.get('incident_id', 'Unknown ID')}")
-			logger.info(f"   📞 Contact: {escalation_result.get('primary_contact', {}).get('name', 'Unknown')}")
-		
-		return {
-			"emperor": AGENTS["emperor"]["name"],
-			"incident_analysis": {
-				"incident_type": incident_type,
-				"severity": severity,
-				"original_text": incident_text,
-				"database_insights_used": list(db_analysis.keys())
-			},
-			"database_analysis": db_analysis,
-			"rag_results": {
-				"case_history_count": len(rag_context.get("case_history", [])),
-				"knowledge_base_count": len(rag_context.get("knowledge_base", [])),
-				"case_history": rag_context.get("case_history", []),
-				"knowledge_base": rag_context.get("knowledge_base", [])
-			},
-			"steps": [strategy, review, decision],
-			"recent_edi": recent_edi,
-			"recommendations": [
-				f"Deploy 安戍 to contain {incident_type} incident",
-				f"工智 to apply fix based on {len(rag_context.get('case_history', []))} similar cases and database analysis",
-				f"清律 to update policy using {len(rag_context.get('knowledge_base', []))} KB references and operational data",
-				f"Monitor system health - Current EDI error rate: {db_analysis.get('system_health', {}).get('edi_health', {}).get('error_rate_percent', 'N/A')}%"
-			],
-			"escalation_summary": escalation_result.get("formatted_summary", "Escalation summary generation failed"),
-			"contact_information": escalation_result.get("primary_contact", {}),
-			"ticket_priority": escalation_result.get("ticket_priority", "P3 - Medium"),
-			"incident_id": escalation_result.get("incident_id", "Unknown")
-		}
+def _build_court_agents() -> Dict[str, Any]:
+	"""Construct the nine Imperial Court agents.
 
-	def _crewai_run(self, incident: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
-		incident_text = incident.get("incident_text", "")
-		rag_context = incident.get("rag_context", {})
-		
-		logger.info("🤖 CREWAI AGENT WORKFLOW INITIATED")
-		logger.info(f"👥 Assembling Expanded Imperial Court: 6 Specialized Agents")
-		
-		if progress_callback:
-			progress_callback(35, "Assembling 6-agent Imperial Court system...")
-		
-		# Get database tool guidance for agents
-		tool_guidance = get_tool_guidance_text()
-		
-		if progress_callback:
-			progress_callback(40, "Creating Agent 察信 (Intelligence Gathering Specialist)...")
-		
-		logger.info("🏗️ Creating specialized multi-agent system with database tool access...")
-		
-		# Create expanded agent system with specialized roles
-		
-		# 1. Intelligence Gathering Agent - First Line Investigation
-		intelligence_agent = CrewAgent(
-			role="察信 (Field Censor) - Intelligence Gathering Specialist",
-			goal="Conduct comprehensive initial investigation and evidence collection using all available database tools",
-			backstory=f"""You are 察信 (Truth Seeker), the Imperial Court's premier intelligence gathering specialist.
+	Nothing here depends on the incident, so the result is built once per
+	worker thread by get_court_agents(); per-incident content lives in the tasks.
+	"""
+	# Get database tool guidance for agents
+	tool_guidance = get_tool_guidance_text()
+	
+	# Route agent LLM calls through the record/replay/cache layer when it is enabled
+	court_llm = get_court_llm()
+	llm_options: Dict[str, Any] = {"llm": court_llm} if court_llm is not None else {}
+	
+	logger.info("🏗️ Creating specialized multi-agent system with database tool access...")
+	
+	# Create expanded agent system with specialized roles
+	
+	# 1. Intelligence Gathering Agent - First Line Investigation
+	intelligence_agent = CrewAgent(
+		role="察信 (Field Censor) - Intelligence Gathering Specialist",
+		goal="Conduct comprehensive initial investigation and evidence collection using all available database tools",
+		backstory=f"""You are 察信 (Truth Seeker), the Imperial Court's premier intelligence gathering specialist.
 
 INVESTIGATION MANDATE: Comprehensive evidence collection using all available database intelligence systems.
 
@@ -310,18 +66,16 @@ COMPLETE INVESTIGATION PROTOCOL:
 
 Your duty: Gather ALL relevant evidence before any other agents begin analysis.
 Motto: "事實勝於雄辯" - Facts are more eloquent than speeches.""",
-			verbose=True,
-			temperature=0.2,
-		)
-		
-		if progress_callback:
-			progress_callback(42, "Creating Agent 工智 (Technical Analysis Expert)...")
-		
-		# 2. Technical Analysis Agent - Deep Technical Investigation  
-		technical_agent = CrewAgent(
-			role="工智 (Ministry of Works) - Technical Analysis Expert",
-			goal="Perform deep technical analysis of system components, root cause investigation, and technical impact assessment",
-			backstory=f"""You are 工智 (Master of Technical Wisdom), the Imperial Court's chief technical analyst.
+		verbose=True,
+		temperature=0.2,
+		**llm_options,
+	)
+	
+	# 2. Technical Analysis Agent - Deep Technical Investigation  
+	technical_agent = CrewAgent(
+		role="工智 (Ministry of Works) - Technical Analysis Expert",
+		goal="Perform deep technical analysis of system components, root cause investigation, and technical impact assessment",
+		backstory=f"""You are 工智 (Master of Technical Wisdom), the Imperial Court's chief technical analyst.
 
 TECHNICAL ANALYSIS MANDATE: Deep dive technical investigation and root cause analysis.
 
@@ -343,18 +97,16 @@ TECHNICAL INVESTIGATION FRAMEWORK:
 
 Your expertise: Transform raw evidence into technical understanding.
 Engineering principle: "工欲善其事，必先利其器" - To do good work, first sharpen your tools.""",
-			verbose=True,
-			temperature=0.3,
-		)
-		
-		if progress_callback:
-			progress_callback(44, "Creating Agent 金策 (Business Impact Analyst)...")
-		
-		# 3. Business Impact Agent - Operations and Business Analysis
-		business_agent = CrewAgent(
-			role="戶部 (Ministry of Finance) - Business Impact Analyst", 
-			goal="Assess operational and business impact, resource requirements, and strategic implications",
-			backstory=f"""You are 金策 (Financial Strategy), the Imperial Court's business impact assessment specialist.
+		verbose=True,
+		temperature=0.3,
+		**llm_options,
+	)
+	
+	# 3. Business Impact Agent - Operations and Business Analysis
+	business_agent = CrewAgent(
+		role="戶部 (Ministry of Finance) - Business Impact Analyst", 
+		goal="Assess operational and business impact, resource requirements, and strategic implications",
+		backstory=f"""You are 金策 (Financial Strategy), the Imperial Court's business impact assessment specialist.
 
 BUSINESS ANALYSIS MANDATE: Operational impact assessment and resource optimization.
 
@@ -379,15 +131,16 @@ BUSINESS IMPACT FRAMEWORK:
 
 Your domain: Translate technical problems into business understanding.
 Wisdom: "取之有度，用之有節" - Take with measure, use with moderation.""",
-			verbose=True,
-			temperature=0.4,
-		)
-		
-		# 4. Communication Coordinator - Stakeholder Management
-		communication_agent = CrewAgent(
-			role="信儀 (Ministry of Protocol) - Communication Coordinator",
-			goal="Design communication strategy, stakeholder notifications, and escalation pathways",
-			backstory=f"""You are 信儀 (Master of Protocol), the Imperial Court's communication and escalation specialist.
+		verbose=True,
+		temperature=0.4,
+		**llm_options,
+	)
+	
+	# 4. Communication Coordinator - Stakeholder Management
+	communication_agent = CrewAgent(
+		role="信儀 (Ministry of Protocol) - Communication Coordinator",
+		goal="Design communication strategy, stakeholder notifications, and escalation pathways",
+		backstory=f"""You are 信儀 (Master of Protocol), the Imperial Court's communication and escalation specialist.
 
 COMMUNICATION MANDATE: Orchestrate all stakeholder communication and escalation protocols.
 
@@ -411,15 +164,16 @@ COMMUNICATION FRAMEWORK:
 
 Your responsibility: Ensure information flows efficiently to enable rapid response.
 Protocol: "信則人任焉" - When there is trust, people will take responsibility.""",
-			verbose=True,
-			temperature=0.3,
-		)
-		
-		# 5. Strategic Analysis Agent - High-Level Strategy (Enhanced)
-		secretariat_strategy = CrewAgent(
-			role="中書省 智文 - Strategic Synthesis Minister",
-			goal="Synthesize all specialist analysis into comprehensive strategic response framework",
-			backstory=f"""You are 智文 (Minister of Strategic Synthesis), orchestrator of specialized intelligence into unified strategy.
+		verbose=True,
+		temperature=0.3,
+		**llm_options,
+	)
+	
+	# 5. Strategic Analysis Agent - High-Level Strategy (Enhanced)
+	secretariat_strategy = CrewAgent(
+		role="中書省 智文 - Strategic Synthesis Minister",
+		goal="Synthesize all specialist analysis into comprehensive strategic response framework",
+		backstory=f"""You are 智文 (Minister of Strategic Synthesis), orchestrator of specialized intelligence into unified strategy.
 
 STRATEGIC SYNTHESIS MANDATE: Integrate all specialist analysis into cohesive response strategy.
 
@@ -443,15 +197,16 @@ SYNTHESIS FRAMEWORK:
 
 Enhanced Role: You now orchestrate 4 specialist agents rather than conducting primary investigation.
 Philosophy: "統而不治，治而不統" - Coordinate without micromanaging, manage without controlling.""",
-			verbose=True,
-			temperature=0.4,
-		)
-		
-		# 6. Quality Validation Agent (Enhanced)
-		secretariat_review = CrewAgent(
-			role="門下省 明鏡 - Multi-Domain Validation Authority",
-			goal="Comprehensive validation across technical, business, communication, and strategic dimensions", 
-			backstory=f"""You are 明鏡 (Mirror of Universal Clarity), supreme validation authority across all specialist domains.
+		verbose=True,
+		temperature=0.4,
+		**llm_options,
+	)
+	
+	# 6. Quality Validation Agent (Enhanced)
+	secretariat_review = CrewAgent(
+		role="門下省 明鏡 - Multi-Domain Validation Authority",
+		goal="Comprehensive validation across technical, business, communication, and strategic dimensions", 
+		backstory=f"""You are 明鏡 (Mirror of Universal Clarity), supreme validation authority across all specialist domains.
 
 MULTI-DOMAIN VALIDATION MANDATE: Rigorous verification across all specialist analysis areas.
 
@@ -479,18 +234,16 @@ COMPREHENSIVE VALIDATION FRAMEWORK:
 
 Enhanced Authority: Validate the work of 4 specialist agents plus strategic synthesis.
 Principle: "明鏡照形，古事知今" - Clear mirror reflects form, ancient events illuminate present.""",
-			verbose=True,
-			temperature=0.3,
-		)
-		
-		if progress_callback:
-			progress_callback(46, "Creating Agent 太和智君 (Emperor - Supreme Authority)...")
-		
-		# 7. Emperor - Final Decision Maker (Enhanced for Multi-Agent Synthesis)
-		emperor = CrewAgent(
-			role="Emperor 太和智君 - Supreme Multi-Domain Authority",
-			goal="Synthesize all specialist intelligence and provide comprehensive incident analysis with precise classification",
-			backstory=f"""You are 太和智君 (Emperor of Supreme Harmony), ultimate decision-maker synthesizing intelligence from 5 specialist domains.
+		verbose=True,
+		temperature=0.3,
+		**llm_options,
+	)
+	
+	# 7. Emperor - Final Decision Maker (Enhanced for Multi-Agent Synthesis)
+	emperor = CrewAgent(
+		role="Emperor 太和智君 - Supreme Multi-Domain Authority",
+		goal="Synthesize all specialist intelligence and provide comprehensive incident analysis with precise classification",
+		backstory=f"""You are 太和智君 (Emperor of Supreme Harmony), ultimate decision-maker synthesizing intelligence from 5 specialist domains.
 
 IMPERIAL MANDATE: Provide comprehensive incident analysis with precise classification that enables automatic escalation.
 
@@ -514,15 +267,16 @@ Your incident classification determines automatic contact selection by the escal
 Use EXACT terms: Container Management, EDI Communication, PORTNET System, Vessel Operations, or Others.
 
 Enhanced Wisdom: "兼聽則明，偏信則暗" - Listen to all specialists to achieve clarity, provide precise classification for proper escalation.""",
-			verbose=True,
-			temperature=0.2,
-		)
-		
-		# 8. Solution Agent - RAG-based Historical Solution Analysis
-		solution_agent = CrewAgent(
-			role="Imperial Solution Archivist 史官",
-			goal="Analyze historical case patterns from RAG context to propose proven solutions",
-			backstory=f"""You are 史官 (Imperial Archivist), keeper of institutional memory and proven solutions from historical incidents.
+		verbose=True,
+		temperature=0.2,
+		**llm_options,
+	)
+	
+	# 8. Solution Agent - RAG-based Historical Solution Analysis
+	solution_agent = CrewAgent(
+		role="Imperial Solution Archivist 史官",
+		goal="Analyze historical case patterns from RAG context to propose proven solutions",
+		backstory=f"""You are 史官 (Imperial Archivist), keeper of institutional memory and proven solutions from historical incidents.
 
 SOLUTION MANDATE: Extract actionable solutions from historical case patterns and knowledge base.
 
@@ -556,15 +310,16 @@ Generate a "**HISTORICAL SOLUTION ANALYSIS**" section with:
 Your wisdom ensures current incidents benefit from institutional memory and proven solutions.
 
 Principle: "溫故知新" - Review the old to understand the new.""",
-			verbose=True,
-			temperature=0.3,
-		)
-		
-		# 9. Escalation Agent - Automated Contact Selection and Summary Generation
-		escalation_agent = CrewAgent(
-			role="Imperial Escalation Manager 朝廷",
-			goal="Generate definitive escalation summary with precise contact selection based on Emperor's analysis",
-			backstory=f"""You are the Imperial Escalation Manager, specialized in converting comprehensive incident analysis into actionable escalation summaries with the correct contact information.
+		verbose=True,
+		temperature=0.3,
+		**llm_options,
+	)
+	
+	# 9. Escalation Agent - Automated Contact Selection and Summary Generation
+	escalation_agent = CrewAgent(
+		role="Imperial Escalation Manager 朝廷",
+		goal="Generate definitive escalation summary with precise contact selection based on Emperor's analysis",
+		backstory=f"""You are the Imperial Escalation Manager, specialized in converting comprehensive incident analysis into actionable escalation summaries with the correct contact information.
 
 ESCALATION MANDATE: Transform Emperor's analysis into structured escalation summary with proper contact selection and escalation paths.
 
@@ -603,17 +358,47 @@ CRITICAL: Use ONLY the contacts and escalation paths defined in contacts.json. D
 Your role ensures Emperor's analysis becomes actionable escalation with the correct contact and proper escalation procedures.
 
 Principle: "令出如山，責任到人" - Orders must be clear as mountains, responsibility assigned to specific individuals.""",
-			verbose=True,
-			temperature=0.1,
-		)
-
-		logger.info("📋 Creating comprehensive multi-agent task workflow...")
-
-		# Create multi-phase task workflow with 6 specialized agents
-		
-		# Phase 1: Intelligence Gathering
-		intelligence_task = CrewTask(
-			description=f"""INTELLIGENCE GATHERING MISSION: Comprehensive evidence collection and initial investigation.
+		verbose=True,
+		temperature=0.1,
+		**llm_options,
+	)
+	
+	return {
+		"intelligence": intelligence_agent,
+		"technical": technical_agent,
+		"business": business_agent,
+		"communication": communication_agent,
+		"secretariat_strategy": secretariat_strategy,
+		"secretariat_review": secretariat_review,
+		"emperor": emperor,
+		"solution": solution_agent,
+		"escalation": escalation_agent,
+	}
+
+
+def _build_court_tasks(agents: Dict[str, Any], incident_text: str, parallel_specialists: bool) -> Dict[str, Any]:
+	"""The seven-phase court workflow as named CrewAI tasks, in execution order.
+
+	In parallel mode phases 2A-2C run as async tasks. CrewAI's sequential process
+	then carries only the joined async outputs forward, so every later phase
+	lists its full history as explicit context; each task sees the same upstream
+	outputs in both modes (checked by scripts/compare_crew_task_context.py).
+	"""
+	intelligence_agent = agents["intelligence"]
+	technical_agent = agents["technical"]
+	business_agent = agents["business"]
+	communication_agent = agents["communication"]
+	secretariat_strategy = agents["secretariat_strategy"]
+	secretariat_review = agents["secretariat_review"]
+	emperor = agents["emperor"]
+	solution_agent = agents["solution"]
+	escalation_agent = agents["escalation"]
+	
+	# Create multi-phase task workflow with 6 specialized agents
+	
+	# Phase 1: Intelligence Gathering
+	intelligence_task = CrewTask(
+		description=f"""INTELLIGENCE GATHERING MISSION: Comprehensive evidence collection and initial investigation.
 
 INCIDENT TEXT:
 {incident_text}
@@ -645,13 +430,21 @@ MANDATORY INVESTIGATION PROTOCOL:
    - Prepare evidence package for specialist analysis
 
 DELIVERABLE: Comprehensive evidence dossier with all relevant database findings, system baseline, and pattern analysis.""",
-			expected_output="Complete evidence dossier including system baseline, targeted investigation results, pattern analysis, and organized factual findings ready for specialist analysis",
-			agent=intelligence_agent,
-		)
-		
-		# Phase 2A: Technical Analysis (Parallel)
-		technical_task = CrewTask(
-			description=f"""TECHNICAL ANALYSIS MISSION: Deep technical investigation and root cause analysis.
+		expected_output="Complete evidence dossier including system baseline, targeted investigation results, pattern analysis, and organized factual findings ready for specialist analysis",
+		agent=intelligence_agent,
+	)
+	
+	# Phases 2A-2C only need the intelligence dossier: in parallel mode they run
+	# as concurrent async tasks that the strategic synthesis joins on
+	specialist_options: Dict[str, Any] = {"async_execution": True, "context": [intelligence_task]} if parallel_specialists else {}
+	
+	def history(*upstream: Any) -> Dict[str, Any]:
+		"""Explicit context equal to the sequential default (every earlier phase), parallel mode only."""
+		return {"context": list(upstream)} if parallel_specialists else {}
+	
+	# Phase 2A: Technical Analysis (Parallel)
+	technical_task = CrewTask(
+		description=f"""TECHNICAL ANALYSIS MISSION: Deep technical investigation and root cause analysis.
 
 PREREQUISITES: Receive evidence dossier from Intelligence Gathering Agent (察信).
 
@@ -680,13 +473,14 @@ TECHNICAL INVESTIGATION FRAMEWORK:
    - Preventive measures to avoid recurrence
 
 DELIVERABLE: Technical analysis report with root cause, impact assessment, and technical response plan.""",
-			expected_output="Comprehensive technical analysis including root cause identification, impact quantification, recovery complexity assessment, and technical response recommendations",
-			agent=technical_agent,
-		)
-		
-		# Phase 2B: Business Impact Analysis (Parallel) 
-		business_task = CrewTask(
-			description=f"""BUSINESS IMPACT ANALYSIS MISSION: Operational impact assessment and resource optimization.
+		expected_output="Comprehensive technical analysis including root cause identification, impact quantification, recovery complexity assessment, and technical response recommendations",
+		agent=technical_agent,
+		**specialist_options,
+	)
+	
+	# Phase 2B: Business Impact Analysis (Parallel) 
+	business_task = CrewTask(
+		description=f"""BUSINESS IMPACT ANALYSIS MISSION: Operational impact assessment and resource optimization.
 
 PREREQUISITES: Receive evidence dossier from Intelligence Gathering Agent (察信).
 
@@ -716,13 +510,14 @@ BUSINESS ANALYSIS FRAMEWORK:
    - Recommend strategic communication approaches
 
 DELIVERABLE: Business impact analysis with operational effects, continuity options, resource requirements, and strategic implications.""",
-			expected_output="Comprehensive business analysis including operational impact quantification, continuity planning, resource optimization, and strategic implications assessment",
-			agent=business_agent,
-		)
-		
-		# Phase 2C: Communication Strategy (Parallel)
-		communication_task = CrewTask(
-			description=f"""COMMUNICATION COORDINATION MISSION: Stakeholder management and escalation pathway design.
+		expected_output="Comprehensive business analysis including operational impact quantification, continuity planning, resource optimization, and strategic implications assessment",
+		agent=business_agent,
+		**specialist_options,
+	)
+	
+	# Phase 2C: Communication Strategy (Parallel)
+	communication_task = CrewTask(
+		description=f"""COMMUNICATION COORDINATION MISSION: Stakeholder management and escalation pathway design.
 
 PREREQUISITES: Receive evidence dossier from Intelligence Gathering Agent (察信).
 
@@ -752,13 +547,14 @@ COMMUNICATION STRATEGY FRAMEWORK:
    - Establish feedback loops for communication effectiveness
 
 DELIVERABLE: Communication strategy with stakeholder mapping, escalation pathways, and coordination protocols.""",
-			expected_output="Comprehensive communication plan including stakeholder mapping, escalation pathway design, message strategy, and coordination protocols for effective incident management",
-			agent=communication_agent,
-		)
-		
-		# Phase 3: Strategic Synthesis
-		strategic_task = CrewTask(
-			description=f"""STRATEGIC SYNTHESIS MISSION: Integrate all specialist intelligence into unified response strategy.
+		expected_output="Comprehensive communication plan including stakeholder mapping, escalation pathway design, message strategy, and coordination protocols for effective incident management",
+		agent=communication_agent,
+		**specialist_options,
+	)
+	
+	# Phase 3: Strategic Synthesis
+	strategic_task = CrewTask(
+		description=f"""STRATEGIC SYNTHESIS MISSION: Integrate all specialist intelligence into unified response strategy.
 
 PREREQUISITES: Receive analysis from Technical, Business, and Communication specialists.
 
@@ -788,13 +584,14 @@ STRATEGIC INTEGRATION FRAMEWORK:
    - Prepare comprehensive briefing for Emperor's final decision
 
 DELIVERABLE: Integrated strategic response framework ready for imperial validation and decision.""",
-			expected_output="Comprehensive strategic synthesis integrating technical, business, and communication analysis into unified response strategy with prioritized recommendations and implementation roadmap",
-			agent=secretariat_strategy,
-		)
-		
-		# Phase 4: Quality Validation
-		validation_task = CrewTask(
-			description=f"""MULTI-DOMAIN VALIDATION MISSION: Comprehensive verification across all specialist analyses.
+		expected_output="Comprehensive strategic synthesis integrating technical, business, and communication analysis into unified response strategy with prioritized recommendations and implementation roadmap",
+		agent=secretariat_strategy,
+		**history(intelligence_task, technical_task, business_task, communication_task),
+	)
+	
+	# Phase 4: Quality Validation
+	validation_task = CrewTask(
+		description=f"""MULTI-DOMAIN VALIDATION MISSION: Comprehensive verification across all specialist analyses.
 
 PREREQUISITES: Receive strategic synthesis and all specialist analyses.
 
@@ -830,13 +627,14 @@ VALIDATION FRAMEWORK:
    - Confirm readiness for imperial decision-making
 
 DELIVERABLE: Comprehensive validation report confirming analysis quality and strategic readiness.""",
-			expected_output="Multi-domain validation report confirming technical accuracy, business feasibility, communication viability, strategic integration quality, and overall readiness for final imperial decision",
-			agent=secretariat_review,
-		)
-		
-		# Phase 5: Imperial Decision
-		decision_task = CrewTask(
-			description=f"""IMPERIAL DECISION MISSION: Synthesize all specialist intelligence into comprehensive incident analysis.
+		expected_output="Multi-domain validation report confirming technical accuracy, business feasibility, communication viability, strategic integration quality, and overall readiness for final imperial decision",
+		agent=secretariat_review,
+		**history(intelligence_task, technical_task, business_task, communication_task, strategic_task),
+	)
+	
+	# Phase 5: Imperial Decision
+	decision_task = CrewTask(
+		description=f"""IMPERIAL DECISION MISSION: Synthesize all specialist intelligence into comprehensive incident analysis.
 
 PREREQUISITES: Receive validated strategic synthesis and all specialist intelligence.
 
@@ -872,13 +670,14 @@ IMPERIAL SYNTHESIS PROTOCOL:
 CRITICAL: Use precise classification terms as this determines escalation routing by the Escalation Manager.
 
 Previous findings from specialist agents will be provided by the CrewAI workflow execution.""",
-			expected_output="Comprehensive incident analysis with precise classification (Container Management/EDI Communication/PORTNET System/Vessel Operations/Others), severity level (High/Medium/Low), detailed findings from all agents, recommended actions, and timelines.",
-			agent=emperor,
-		)
-		
-		# Phase 6: Historical Solution Analysis
-		solution_task = CrewTask(
-			description=f"""HISTORICAL SOLUTION ANALYSIS MISSION: Extract proven solutions from RAG case history and knowledge base.
+		expected_output="Comprehensive incident analysis with precise classification (Container Management/EDI Communication/PORTNET System/Vessel Operations/Others), severity level (High/Medium/Low), detailed findings from all agents, recommended actions, and timelines.",
+		agent=emperor,
+		**history(intelligence_task, technical_task, business_task, communication_task, strategic_task, validation_task),
+	)
+	
+	# Phase 6: Historical Solution Analysis
+	solution_task = CrewTask(
+		description=f"""HISTORICAL SOLUTION ANALYSIS MISSION: Extract proven solutions from RAG case history and knowledge base.
 
 PREREQUISITES: Receive Emperor's comprehensive incident analysis with classification and RAG context.
 
@@ -912,13 +711,14 @@ SOLUTION ANALYSIS PROTOCOL:
    - Provide realistic timeline expectations based on historical data
 
 DELIVERABLE: Historical solution analysis with proven approaches, timeline expectations, and risk considerations based on institutional memory.""",
-			expected_output="Comprehensive historical solution analysis including similar past incidents, proven resolution methods, timeline expectations, risk considerations, and recommended approach based on RAG case history and knowledge base patterns.",
-			agent=solution_agent,
-		)
-		
-		# Phase 7: Escalation Summary Generation
-		escalation_task = CrewTask(
-			description=f"""ESCALATION SUMMARY MISSION: Generate definitive escalation summary with precise contact selection and proper escalation paths.
+		expected_output="Comprehensive historical solution analysis including similar past incidents, proven resolution methods, timeline expectations, risk considerations, and recommended approach based on RAG case history and knowledge base patterns.",
+		agent=solution_agent,
+		**history(intelligence_task, technical_task, business_task, communication_task, strategic_task, validation_task, decision_task),
+	)
+	
+	# Phase 7: Escalation Summary Generation
+	escalation_task = CrewTask(
+		description=f"""ESCALATION SUMMARY MISSION: Generate definitive escalation summary with precise contact selection and proper escalation paths.
 
 PREREQUISITES: Receive Emperor's comprehensive incident analysis and Historical Solution Analysis.
 
@@ -983,9 +783,373 @@ ESCALATION GENERATION PROTOCOL:
 CRITICAL: Do NOT create fictional contacts. Use only the 4 real contacts from contacts.json.
 
 Previous analysis from Emperor and Historical Solution Agent provides all needed context.""",
-			expected_output="Professional escalation summary with specific contact person from contacts.json, incident details, business impact, historical solution analysis, recommended actions with timeline, and proper escalation procedures from contacts.json. Must include actual person name and email address based on incident type classification.",
-			agent=escalation_agent,
+		expected_output="Professional escalation summary with specific contact person from contacts.json, incident details, business impact, historical solution analysis, recommended actions with timeline, and proper escalation procedures from contacts.json. Must include actual person name and email address based on incident type classification.",
+		agent=escalation_agent,
+		**history(intelligence_task, technical_task, business_task, communication_task, strategic_task, validation_task, decision_task, solution_task),
+	)
+	
+	return {
+		"intelligence": intelligence_task,
+		"technical": technical_task,
+		"business": business_task,
+		"communication": communication_task,
+		"strategic": strategic_task,
+		"validation": validation_task,
+		"decision": decision_task,
+		"solution": solution_task,
+		"escalation": escalation_task,
+	}
+
+
+def get_court_agents() -> Tuple[Dict[str, Any], float, bool]:
+	"""Return (agents, build_seconds, cached) for the calling thread.
+
+	Agents are cached per thread because CrewAI mutates an agent while it runs
+	a crew; a prefork Celery worker therefore builds them exactly once.
+	"""
+	agents = getattr(_court_agents, "agents", None)
+	if agents is not None:
+		return agents, _court_agents.build_seconds, True
+	started = time.perf_counter()
+	agents = _build_court_agents()
+	_court_agents.agents = agents
+	_court_agents.build_seconds = time.perf_counter() - started
+	return agents, _court_agents.build_seconds, False
+
+
+class ImperialOrchestrator:
+	def __init__(self) -> None:
+		# Use config settings instead of direct environment variable access
+		self.mock_mode = settings.mock_mode
+		self.crewai_available = external_available and not self.mock_mode
+		
+		logger.info(f"🔧 Orchestrator initialized - Mock Mode: {self.mock_mode}, CrewAI Available: {self.crewai_available}")
+		logger.info(f"🔧 External Available: {external_available}, Settings Mock Mode: {settings.mock_mode}")
+
+	def _search_collection(self, query_text: str, collection: str, top_k: int = 3, vector: List[float] | None = None, timeout: float | None = None) -> List[Dict[str, Any]]:
+		"""Search specific Qdrant collection for RAG context."""
+		try:
+			logger.debug(f"🔍 Searching {collection} collection for: '{query_text[:50]}{'...' if len(query_text) > 50 else ''}'")
+			from .rag_embeddings import embed_texts
+			from .rag_qdrant import get_store
+			
+			vec = vector if vector is not None else embed_texts([query_text])[0]
+			store = get_store(collection)
+			
+			hits = store.search(vector=vec, top_k=top_k, timeout=timeout)
+			logger.debug(f"   📊 Found {len(hits)} results in {collection}")
+			return hits
+		except Exception as e:
+			logger.warning(f"RAG search failed for collection {collection}: {e}")
+			return []
+
+	def _gather_rag_context(self, incident_text: str) -> Dict[str, Any]:
+		"""Gather RAG context from case history and knowledge base collections.
+
+		The incident is embedded once and both collections are searched concurrently;
+		a collection that does not answer within ``settings.rag_search_timeout`` contributes no hits.
+		The same budget is passed to Qdrant so a slow query is aborted server-side
+		instead of holding a search thread after we stop waiting for it.
+		"""
+		collections = ["imperial_court_case_history", "imperial_court_knowledge_base"]
+		results: Dict[str, List[Dict[str, Any]]] = {c: [] for c in collections}
+		try:
+			from .rag_embeddings import embed_texts
+			vector = embed_texts([incident_text])[0]
+		except Exception as e:
+			logger.warning(f"RAG embedding failed for incident: {e}")
+			vector = None
+		
+		if vector is not None:
+			timeout = settings.rag_search_timeout
+			futures = {c: _RAG_EXECUTOR.submit(self._search_collection, incident_text, c, 3, vector, timeout) for c in collections}
+			deadline = time.monotonic() + timeout
+			for c, fut in futures.items():
+				try:
+					results[c] = fut.result(timeout=max(0.0, deadline - time.monotonic()))
+				except concurrent.futures.TimeoutError:
+					# Drop it from the queue if no search thread picked it up yet
+					if fut.cancel():
+						logger.warning(f"RAG search for collection {c} cancelled: still queued after {timeout}s (search pool busy)")
+					else:
+						logger.warning(f"RAG search timed out for collection {c} after {timeout}s; Qdrant aborts it at its own timeout")
+		
+		case_history = results["imperial_court_case_history"]
+		knowledge_base = results["imperial_court_knowledge_base"]
+		return {
+			"case_history": case_history,
+			"knowledge_base": knowledge_base,
+			"case_history_summary": "\n".join([f"- {doc.get('text', '')[:200]}..." for doc in case_history]),
+			"knowledge_base_summary": "\n".join([f"- {doc.get('text', '')[:200]}..." for doc in knowledge_base])
+		}
+
+	def run(self, incident: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
+		incident_text = incident.get("incident_text", "")
+		if not incident_text:
+			return {"error": "No incident text provided"}
+		
+		logger.info("🏛️ IMPERIAL COURT INCIDENT PROCESSING INITIATED")
+		logger.info(f"📋 Incident Text: {incident_text[:100]}{'...' if len(incident_text) > 100 else ''}")
+		
+		if progress_callback:
+			progress_callback(15, "Gathering RAG context from historical cases...")
+		
+		# Gather RAG context first
+		logger.info("🔍 Gathering RAG context from historical cases and knowledge base...")
+		rag_context = self._gather_rag_context(incident_text)
+		logger.info(f"📚 RAG Context Retrieved - Cases: {len(rag_context.get('case_history', []))}, KB: {len(rag_context.get('knowledge_base', []))}")
+		
+		if progress_callback:
+			progress_callback(25, "RAG context gathered, preparing agent workflow...")
+		
+		# Add RAG context to incident data for agents
+		enhanced_incident = {
+			**incident,
+			"rag_context": rag_context
+		}
+		
+		if not self.crewai_available:
+			if not self.mock_mode and llm_cache_mode() == "replay":
+				raise RuntimeError("LLM_CACHE_MODE=replay needs CrewAI, which is not available; refusing to substitute mock output")
+			logger.info("🎭 Running in MOCK_MODE; returning synthesized results")
+			return self._mock_run(enhanced_incident, progress_callback)
+		
+		logger.info("🤖 Initiating CrewAI Agent Workflow...")
+		return self._crewai_run(enhanced_incident, progress_callback)
+
+	def _mock_run(self, incident: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
+		incident_text = incident.get("incident_text", "")
+		rag_context = incident.get("rag_context", {})
+		
+		logger.info("🎭 MOCK MODE AGENT SIMULATION INITIATED")
+		
+		if progress_callback:
+			progress_callback(30, "Initializing Imperial Court agents...")
+		
+		# Agent think time comes from the pluggable simulation engine (zero/fixed/sampled)
+		sim = get_simulation_engine()
+		simulated_seconds = sim.pause("initialize", 2)
+		
+		# Enhanced mock mode with database tool simulation
+		tools = AgentDatabaseTools()
+		
+		if progress_callback:
+			progress_callback(40, "Agent 太和智君 (Emperor) analyzing incident...")
+		
+		# Simulate agent using database tools for analysis
+		logger.info("📊 Simulating agent database tool usage...")
+		db_analysis = {}
+		try:
+			# Simulate operational overview check
+			logger.info("   🔍 Agent retrieving operational overview...")
+			operational_data = tools.get_operational_overview()
+			db_analysis["operational_overview"] = operational_data
+			logger.info(f"   ✅ Operational data retrieved: {operational_data.get('total_vessels', 'N/A')} vessels")
+			
+			simulated_seconds += sim.pause("strategy_review", 2)
+			if progress_callback:
+				progress_callback(50, "Agent 智文 (Grand Secretariat Strategy) reviewing data...")
+			
+			# Simulate system health check
+			logger.info("   🏥 Agent checking system health...")
+			health_data = tools.check_system_health()
+			db_analysis["system_health"] = health_data
+			if "edi_health" in health_data:
+				edi_rate = health_data["edi_health"].get("error_rate_percent", 0)
+				logger.info(f"   ✅ System health retrieved: {edi_rate}% EDI error rate")
+			else:
+				logger.info("   ⚠️ System health data not available")
+			
+			# Look for keywords in incident for targeted searches
+			text_lower = incident_text.lower()
+			if any(word in text_lower for word in ["container", "cntr", "msku", "oolu", "temu", "cmau"]):
+				if progress_callback:
+					progress_callback(60, "Agent 行吏 (Ministry Personnel) searching container details...")
+				logger.info("   📦 Agent detected container-related incident, searching containers...")
+				# Extract potential container number
+				words = incident_text.split()
+				for word in words:
+					if len(word) >= 10 and any(prefix in word.upper() for prefix in ["MSKU", "OOLU", "TEMU", "CMAU"]):
+						logger.info(f"   🔍 Agent searching for container: {word.upper()}")
+						container_data = tools.get_container_details(word.upper())
+						if container_data:
+							db_analysis["container_details"] = container_data
+							logger.info(f"   ✅ Container details retrieved for {word.upper()}")
+						break
+			
+			simulated_seconds += sim.pause("edi_review", 2)
+			if progress_callback:
+				progress_callback(70, "Agent 明鏡 (Grand Secretariat Review) analyzing EDI messages...")
+			
+			if any(word in text_lower for word in ["edi", "message", "coparn", "coarri", "codeco"]):
+				logger.info("   📡 Agent detected EDI-related incident, analyzing messages...")
+				edi_data = tools.analyze_edi_messages(hours_back=12, limit=10)
+				db_analysis["edi_analysis"] = edi_data
+				if "total_messages" in edi_data:
+					logger.info(f"   ✅ EDI analysis completed: {edi_data['total_messages']} messages analyzed")
+				
+		except Exception as e:
+			logger.warning(f"Mock database analysis failed: {e}")
+		
+		# Enhanced incident classification based on database insights
+		simulated_seconds += sim.pause("classification", 2)
+		if progress_callback:
+			progress_callback(80, "Agent 公衡 (Censorate Chief) classifying incident severity...")
+		
+		logger.info("🧠 Agent analyzing incident type and severity...")
+		incident_type = "General"
+		severity = "Medium"
+		
+		text_lower = incident_text.lower()
+		if "email" in text_lower or "alr-" in text_lower:
+			incident_type = "Email System"
+		elif "container" in text_lower or "duplicate" in text_lower:
+			incident_type = "Container Management"
+		elif "portnet" in text_lower:
+			incident_type = "PORTNET System"
+		elif "edi" in text_lower:
+			incident_type = "EDI Communication"
+		
+		logger.info(f"   📋 Incident classified as: {incident_type}")
+		
+		# Severity assessment considering system health
+		if "urgent" in text_lower or "critical" in text_lower:
+			severity = "High"
+		elif "low" in text_lower or "minor" in text_lower:
+			severity = "Low"
+		else:
+			# Check system health for dynamic severity assessment
+			health = db_analysis.get("system_health", {})
+			edi_health = health.get("edi_health", {})
+			api_health = health.get("api_health", {})
+			
+			if (edi_health.get("error_rate_percent", 0) > 10 or 
+				api_health.get("error_rate_percent", 0) > 10):
+				severity = "High"  # System already stressed
+				logger.info("   ⚠️ Severity elevated to HIGH due to system stress")
+		
+		logger.info(f"   ⚖️ Severity assessed as: {severity}")
+		
+		# Agent decision simulation
+		simulated_seconds += sim.pause("decision", 1)
+		if progress_callback:
+			progress_callback(85, "All agents formulating strategic response...")
+		
+		logger.info("🎯 Agents formulating strategic response...")
+		strategy = f"智文 analyzes {incident_type} incident with severity {severity} using database insights"
+		review = f"明鏡 reviews policy for {incident_type} incidents using knowledge base and operational data"
+		decision = f"太和智君 decides on resource allocation for {severity} priority incident based on system health"
+		
+		logger.info(f"   📝 Strategic Analysis (智文): {strategy}")
+		logger.info(f"   🔍 Policy Review (明鏡): {review}")
+		logger.info(f"   👑 Imperial Decision (太和智君): {decision}")
+		
+		simulated_seconds += sim.pause("escalation", 2)
+		if progress_callback:
+			progress_callback(90, "Agent 察信 (Censorate Field) generating escalation summary...")
+		
+		try:
+			recent = list_recent_edi_messages(5)
+			recent_edi = [{"message_type": r.get("message_type"), "sent_at": r.get("sent_at")} for r in recent]
+		except Exception:
+			recent_edi = []
+		
+		logger.info("✅ MOCK MODE AGENT PROCESSING COMPLETED")
+		
+		# Generate escalation summary in mock mode
+		logger.info("🎫 Generating escalation summary with contact information...")
+		escalation_result = tools.generate_escalation_summary(
+			{"incident_analysis": {
+				"incident_type": incident_type,
+				"severity": severity,
+				"original_text": incident_text,
+				"database_insights_used": list(db_analysis.keys())
+			}},
+			db_analysis,
+			f"Strategic analysis: {strategy}. Review: {review}. Decision: {decision}"
 		)
+		
+		if "error" not in escalation_result:
+			logger.info(f"   ✅ Escalation summary generated: {escalation_result.get('incident_id', 'Unknown ID')}")
+			logger.info(f"   📞 Contact: {escalation_result.get('primary_contact', {}).get('name', 'Unknown')}")
+		
+		return {
+			"emperor": AGENTS["emperor"]["name"],
+			"incident_analysis": {
+				"incident_type": incident_type,
+				"severity": severity,
+				"original_text": incident_text,
+				"database_insights_used": list(db_analysis.keys())
+			},
+			"database_analysis": db_analysis,
+			"rag_results": {
+				"case_history_count": len(rag_context.get("case_history", [])),
+				"knowledge_base_count": len(rag_context.get("knowledge_base", [])),
+				"case_history": rag_context.get("case_history", []),
+				"knowledge_base": rag_context.get("knowledge_base", [])
+			},
+			"steps": [strategy, review, decision],
+			"recent_edi": recent_edi,
+			"recommendations": [
+				f"Deploy 安戍 to contain {incident_type} incident",
+				f"工智 to apply fix based on {len(rag_context.get('case_history', []))} similar cases and database analysis",
+				f"清律 to update policy using {len(rag_context.get('knowledge_base', []))} KB references and operational data",
+				f"Monitor system health - Current EDI error rate: {db_analysis.get('system_health', {}).get('edi_health', {}).get('error_rate_percent', 'N/A')}%"
+			],
+			"escalation_summary": escalation_result.get("formatted_summary", "Escalation summary generation failed"),
+			"contact_information": escalation_result.get("primary_contact", {}),
+			"ticket_priority": escalation_result.get("ticket_priority", "P3 - Medium"),
+			"incident_id": escalation_result.get("incident_id", "Unknown"),
+			"tool_cache": tools.cache.stats(),
+			"simulation": {
+				"mode": sim.mode,
+				"simulated_seconds": round(simulated_seconds, 3)
+			}
+		}
+
+	def _crewai_run(self, incident: Dict[str, Any], progress_callback=None) -> Dict[str, Any]:
+		incident_text = incident.get("incident_text", "")
+		rag_context = incident.get("rag_context", {})
+		
+		logger.info("🤖 CREWAI AGENT WORKFLOW INITIATED")
+		logger.info(f"👥 Assembling Expanded Imperial Court: 6 Specialized Agents")
+		
+		if progress_callback:
+			progress_callback(35, "Assembling 6-agent Imperial Court system...")
+		
+		setup_started = time.perf_counter()
+		agents, build_seconds, agents_cached = get_court_agents()
+		setup_seconds = time.perf_counter() - setup_started
+		intelligence_agent = agents["intelligence"]
+		technical_agent = agents["technical"]
+		business_agent = agents["business"]
+		communication_agent = agents["communication"]
+		secretariat_strategy = agents["secretariat_strategy"]
+		secretariat_review = agents["secretariat_review"]
+		emperor = agents["emperor"]
+		solution_agent = agents["solution"]
+		escalation_agent = agents["escalation"]
+		
+		if agents_cached:
+			logger.info(f"♻️ Reusing cached Imperial Court agents (saved {build_seconds * 1000:.0f} ms of setup)")
+		else:
+			logger.info(f"🏗️ Built Imperial Court agents in {build_seconds * 1000:.0f} ms (cached for later incidents)")
+		if progress_callback:
+			progress_callback(46, "Imperial Court agents ready...")
+
+		logger.info("📋 Creating comprehensive multi-agent task workflow...")
+
+		parallel_specialists = settings.crew_parallel_specialists
+		tasks = _build_court_tasks(agents, incident_text, parallel_specialists)
+		intelligence_task = tasks["intelligence"]
+		technical_task = tasks["technical"]
+		business_task = tasks["business"]
+		communication_task = tasks["communication"]
+		strategic_task = tasks["strategic"]
+		validation_task = tasks["validation"]
+		decision_task = tasks["decision"]
+		solution_task = tasks["solution"]
+		escalation_task = tasks["escalation"]
 
 		if progress_callback:
 			progress_callback(48, "Assembling Imperial Court crew with 8 agents...")
@@ -1019,6 +1183,8 @@ Previous analysis from Emperor and Historical Solution Agent provides all needed
 		
 		logger.info("🚀 INITIATING EXPANDED CREWAI WORKFLOW EXECUTION...")
 		logger.info("   Phase 1: 察信 (Intelligence) - Comprehensive evidence gathering")
+		if parallel_specialists:
+			logger.info("   Phases 2A-2C run concurrently and are joined before Phase 3")
 		logger.info("   Phase 2A: 工智 (Technical) - Deep technical analysis and root cause")
 		logger.info("   Phase 2B: 金策 (Business) - Operational impact and resource assessment")
 		logger.info("   Phase 2C: 信儀 (Communication) - Stakeholder management and escalation design")
@@ -1028,13 +1194,19 @@ Previous analysis from Emperor and Historical Solution Agent provides all needed
 		logger.info("   Phase 6: 史官 (Solution Archivist) - Historical solution analysis from RAG context")
 		logger.info("   Phase 7: 朝廷 (Escalation Manager) - Automated escalation summary with proper contacts")
 		
+		llm_mode = llm_cache_mode()
 		try:
 			if progress_callback:
 				progress_callback(50, "Running agentic crew...")
 			
+			# All court agents share one LLM per worker thread; count this run's calls on it
+			court_llm = getattr(emperor, "llm", None)
+			llm_stats = court_llm.begin_run() if hasattr(court_llm, "begin_run") else None
+			crew_started = time.perf_counter()
 			result_text = crew.kickoff()
+			crew_seconds = time.perf_counter() - crew_started
 		
-			logger.info("✅ CREWAI WORKFLOW COMPLETED SUCCESSFULLY")
+			logger.info(f"✅ CREWAI WORKFLOW COMPLETED SUCCESSFULLY in {crew_seconds:.1f}s")
 			logger.info(f"📜 Final Result Length: {len(str(result_text))} characters")
 			
 			if progress_callback:
@@ -1085,11 +1257,30 @@ Previous analysis from Emperor and Historical Solution Agent provides all needed
 				"crew_output": str(result_text),
 				"contact_information": {"generated_by": "escalation_agent"},
 				"ticket_priority": f"P{'1' if severity == 'High' else '2' if severity == 'Medium' else '3'}",
-				"workflow_phases": 7
+				"workflow_phases": 7,
+				"execution": {
+					"parallel_specialists": parallel_specialists,
+					"crew_seconds": round(crew_seconds, 2),
+					"agents_cached": agents_cached,
+					"agent_setup_seconds": round(setup_seconds, 4),
+					"agent_setup_saved_seconds": round(build_seconds - setup_seconds, 4) if agents_cached else 0.0,
+					"llm_cache": {
+						"mode": llm_mode,
+						**(llm_stats.as_dict() if llm_stats is not None else {})
+					}
+				}
 			}
 			
+		except LLMReplayMiss:
+			logger.error("❌ LLM replay miss: prompt was never recorded; failing the run instead of mocking it")
+			raise
 		except Exception as e:
 			logger.error(f"❌ CrewAI execution failed: {e}")
+			if llm_mode == "replay":
+				# A replay must be reproducible; canned mock output would pass for a real result
+				raise
 			logger.warning("🔄 Falling back to mock mode...")
 			# Fallback to mock if CrewAI fails
-			return self._mock_run(incident, progress_callback)
+			result = self._mock_run(incident, progress_callback)
+			result["execution"] = {"fallback": "mock", "crew_error": str(e), "llm_cache": {"mode": llm_mode}}
+			return result
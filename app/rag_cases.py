@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any
-import uuid
+from typing import List, Dict, Any, Iterable, Iterator
 
 from loguru import logger
 from openpyxl import load_workbook  # type: ignore
+import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 
 from .rag_chunking import smart_chunk
-from .rag_embeddings import embed_texts
-from .rag_qdrant import QdrantStore
+from .rag_embeddings import embed_batches, EMBED_BATCH_SIZE, EMBED_CONCURRENCY, EMBED_MODEL_ID
+from .rag_manifest import IngestManifest, content_hash, point_id
+from .rag_qdrant import get_store
 
 
 def _row_to_text(headers: List[str], row_vals: List[Any]) -> str:
@@ -21,25 +22,48 @@ def _row_to_text(headers: List[str], row_vals: List[Any]) -> str:
 	return "\n".join(pairs)
 
 
-def parse_excel_to_documents(path: str, sheet_name: str | None = None) -> List[Dict[str, Any]]:
+def iter_excel_documents(path: str, sheet_name: str | None = None) -> Iterator[Dict[str, Any]]:
+	"""Stream case documents from a worksheet one row at a time."""
 	wb = load_workbook(filename=path, read_only=True, data_only=True)
-	ws = wb[sheet_name] if sheet_name else wb.active
-	rows = list(ws.rows)
-	if not rows:
-		return []
-	headers = [str(c.value).strip() if c.value is not None else f"col_{i}" for i, c in enumerate(rows[0])]
-	docs: List[Dict[str, Any]] = []
-	for idx, r in enumerate(rows[1:], start=1):
-		vals = [c.value for c in r]
-		text = _row_to_text(headers, vals).strip()
-		if not text:
+	try:
+		ws = wb[sheet_name] if sheet_name else wb.active
+		rows = ws.iter_rows(values_only=True)
+		first = next(rows, None)
+		if first is None:
+			return
+		headers = [str(v).strip() if v is not None else f"col_{i}" for i, v in enumerate(first)]
+		for idx, vals in enumerate(rows, start=1):
+			text = _row_to_text(headers, list(vals)).strip()
+			if not text:
+				continue
+			yield {
+				"id": f"case_row_{idx}",
+				"text": text,
+				"meta": {"row_index": idx, "sheet": ws.title},
+			}
+	finally:
+		wb.close()
+
+
+def parse_excel_to_documents(path: str, sheet_name: str | None = None) -> List[Dict[str, Any]]:
+	return list(iter_excel_documents(path, sheet_name))
+
+
+def _frame_to_texts(df: pd.DataFrame, headers: List[str]) -> pd.Series:
+	"""Column-wise equivalent of applying _row_to_text to every row of ``df``."""
+	if not any(dt == object or pd.api.types.is_string_dtype(dt) for dt in df.dtypes):
+		# iterrows() sees rows of df.values, so all-numeric frames are upcast (ints render as "1.0"); keep that
+		df = pd.DataFrame(df.values, index=df.index, columns=df.columns)
+	text = pd.Series("", index=df.index, dtype=object)
+	for col, h in zip(df.columns, headers):
+		values = df[col]
+		present = values.notna().to_numpy()
+		if not present.any():
 			continue
-		docs.append({
-			"id": f"case_row_{idx}",
-			"text": text,
-			"meta": {"row_index": idx, "sheet": ws.title},
-		})
-	return docs
+		piece = f"{h}: " + values[present].map(str)
+		sep = np.where(text[present].to_numpy(dtype=object) != "", "\n", "")
+		text.loc[present] = text[present] + sep + piece
+	return text.str.strip()
 
 
 def parse_csv_to_documents(path: str) -> List[Dict[str, Any]]:
@@ -72,65 +96,117 @@ def parse_csv_to_documents(path: str) -> List[Dict[str, Any]]:
 	if df.empty:
 		return []
 	headers = list(df.columns.astype(str))
+	texts = _frame_to_texts(df, headers)
+	keep = (texts != "").to_numpy()
+	row_numbers = [int(i) + 1 for i in df.index[keep]]
 	docs: List[Dict[str, Any]] = []
-	for idx, row in df.iterrows():
-		vals = [row.get(h) for h in headers]
-		text = _row_to_text(headers, vals).strip()
-		if not text:
-			continue
+	for n, text in zip(row_numbers, texts[keep].tolist()):
 		docs.append({
-			"id": f"case_row_{idx+1}",
+			"id": f"case_row_{n}",
 			"text": text,
-			"meta": {"row_index": int(idx+1), "sheet": "csv"},
+			"meta": {"row_index": n, "sheet": "csv"},
 		})
 	return docs
 
 
-def _upsert_docs_to_qdrant(docs: List[Dict[str, Any]], source: str, path: str, collection: str = None) -> Dict[str, int]:
-	store = QdrantStore(collection=collection) if collection else QdrantStore()
-	ids: List[str] = []
-	vectors: List[List[float]] = []
-	payloads: List[Dict[str, Any]] = []
+def _pack_row_batches(docs: Iterable[Dict[str, Any]], path: str, previous: Dict[str, str], current: Dict[str, str], counter: Dict[str, int]) -> Iterator[List[Dict[str, Any]]]:
+	"""Chunk rows and pack their new/changed chunks into embedding-sized batches.
+
+	Rows are never split across batches, so a failed batch only affects the
+	rows it contains. Every chunk (new or unchanged) is recorded in ``current``.
+	"""
+	batch: List[Dict[str, Any]] = []
 	for d in docs:
+		counter["rows"] += 1
 		chunks = smart_chunk(d["text"], max_tokens=350, overlap_tokens=50)
 		# Filter out empty/whitespace-only chunks before embedding
 		chunks = [ch.strip() for ch in chunks if isinstance(ch, str) and ch.strip()]
 		if not chunks:
 			logger.debug(f"Skipping doc {d['id']} with no non-empty chunks after chunking")
 			continue
-		try:
-			embs = embed_texts(chunks)
-		except Exception as e:
-			logger.warning(f"Embedding failed for row {d['id']} (path={path}): {e}; skipping row")
-			continue
+		pending: List[Dict[str, Any]] = []
 		for i, ch in enumerate(chunks):
-			ids.append(str(uuid.uuid4()))
-			vectors.append(embs[i])
-			payloads.append({
-				"text": ch,
-				"source": source,
-				"row_id": d["id"],
-				"chunk_index": i,
-				"row_index": d["meta"]["row_index"],
-				"sheet": d["meta"].get("sheet"),
-				"path": path,
-			})
-	if not ids:
-		logger.info("No chunks to upsert; returning empty ingest stats")
-		return {"rows": len(docs), "chunks": 0, "upserted": 0}
-	store.upsert(ids=ids, vectors=vectors, payloads=payloads)
-	return {"rows": len(docs), "chunks": len(ids), "upserted": len(ids)}
+			h = content_hash(ch)
+			pid = point_id(path, f"{d['id']}:{i}", h, EMBED_MODEL_ID)
+			current[pid] = h
+			if pid not in previous:
+				pending.append({"id": pid, "text": ch, "hash": h, "chunk_index": i, "doc": d})
+		if not pending:
+			continue
+		if batch and len(batch) + len(pending) > EMBED_BATCH_SIZE:
+			yield batch
+			batch = []
+		batch.extend(pending)
+	if batch:
+		yield batch
+
+
+def _upsert_docs_to_qdrant(docs: Iterable[Dict[str, Any]], source: str, path: str, collection: str = None) -> Dict[str, int]:
+	store = get_store(collection) if collection else get_store()
+	manifest = IngestManifest(store.collection, EMBED_MODEL_ID)
+	manifest.check_collection(store.points_count())
+	previous = manifest.points_for(path)
+	current: Dict[str, str] = {}
+	counter = {"rows": 0}
+	failed_rows = 0
+
+	def _embed_window(window: List[List[Dict[str, Any]]]) -> None:
+		nonlocal failed_rows
+		results = embed_batches([[item["text"] for item in b] for b in window])
+		for b, res in zip(window, results):
+			if isinstance(res, BaseException):
+				rows = {item["doc"]["id"] for item in b}
+				logger.warning(f"Embedding failed for rows {sorted(rows)} (path={path}): {res}; skipping rows")
+				failed_rows += len(rows)
+				for item in b:
+					current.pop(item["id"], None)
+				continue
+			for item, vec in zip(b, res):
+				d = item["doc"]
+				upserter.add(item["id"], vec, {
+					"text": item["text"],
+					"source": source,
+					"row_id": d["id"],
+					"chunk_index": item["chunk_index"],
+					"row_index": d["meta"]["row_index"],
+					"sheet": d["meta"].get("sheet"),
+					"path": path,
+					"content_hash": item["hash"],
+				})
+
+	# Embed EMBED_CONCURRENCY batches at a time; upserts of one window overlap embedding of the next
+	with store.upserter() as upserter:
+		window: List[List[Dict[str, Any]]] = []
+		for batch in _pack_row_batches(docs, path, previous, current, counter):
+			window.append(batch)
+			if len(window) >= max(1, EMBED_CONCURRENCY):
+				_embed_window(window)
+				window = []
+		if window:
+			_embed_window(window)
+	upserted = upserter.sent
+	# Stats cover this run's rows only, before failed rows fall back to the previous points
+	chunks = len(current)
+	# An empty sheet still runs the stale deletion below: rows removed from the source must leave the collection
+	if failed_rows:
+		# Keep the old points of rows that could not be re-embedded; retry them next run
+		logger.warning(f"{failed_rows} rows failed to embed; deferring deletion of vanished points")
+		stale: List[str] = []
+		current = {**previous, **current}
+	else:
+		stale = [pid for pid in previous if pid not in current]
+		store.delete(stale)
+	manifest.replace(path, current)
+	manifest.save()
+	logger.info(f"Case ingest {path}: {upserted} new/changed chunks, {chunks - upserted} unchanged, {len(stale)} deleted")
+	return {"rows": counter["rows"], "chunks": chunks, "upserted": upserted, "unchanged": chunks - upserted, "deleted": len(stale)}
 
 
 def ingest_cases_excel(path: str = "data/Case Log.xlsx", sheet_name: str | None = None, collection: str = None) -> Dict[str, int]:
-	docs = parse_excel_to_documents(path, sheet_name)
-	if not docs:
-		return {"rows": 0, "chunks": 0, "upserted": 0}
+	docs = iter_excel_documents(path, sheet_name)
 	return _upsert_docs_to_qdrant(docs, source="case_log_excel", path=path, collection=collection)
 
 
 def ingest_cases_csv(path: str = "data/case_log.csv", collection: str = None) -> Dict[str, int]:
 	docs = parse_csv_to_documents(path)
-	if not docs:
-		return {"rows": 0, "chunks": 0, "upserted": 0}
 	return _upsert_docs_to_qdrant(docs, source="case_log_csv", path=path, collection=collection)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import List
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import List, Iterator
 import re
 
 try:
@@ -10,6 +12,13 @@ except Exception:  # fallback: approximate tokenization by words
 	ENC = None
 
 
+# Boundaries are found on the UTF-8 bytes, which is what token offsets index into
+_PARAGRAPH_RE = re.compile(rb"\n\n+")
+_SENTENCE_RE = re.compile(rb"(?<=[.!?])\s+|\n")
+_WORD_RE = re.compile(rb"\S+")
+_token_byte_lengths: List[int] | None = None
+
+
 def normalize_whitespace(text: str) -> str:
 	text = text.replace("\r", "\n")
 	text = re.sub(r"\n{2,}", "\n\n", text)
@@ -23,66 +32,97 @@ def count_tokens(text: str) -> int:
 	return len(ENC.encode(text))
 
 
-def smart_chunk(text: str, max_tokens: int = 400, overlap_tokens: int = 60) -> List[str]:
+def _byte_lengths() -> List[int]:
+	"""Byte length of every token id, built once so offsets need no per-token decode."""
+	global _token_byte_lengths
+	if _token_byte_lengths is None:
+		lengths = [0] * ENC.n_vocab
+		for i in range(ENC.n_vocab):
+			try:
+				lengths[i] = len(ENC.decode_single_token_bytes(i))
+			except KeyError:
+				pass
+		_token_byte_lengths = lengths
+	return _token_byte_lengths
+
+
+def _token_offsets(data: bytes, text: str) -> List[int]:
+	"""Byte offset at which each token of ``text`` starts (one tokenizer pass)."""
+	if ENC is None:
+		return [m.start() for m in _WORD_RE.finditer(data)]
+	tokens = ENC.encode_ordinary(text)
+	offsets = [0]
+	offsets.extend(accumulate(map(_byte_lengths().__getitem__, tokens)))
+	offsets.pop()
+	return offsets
+
+
+def _boundary_tokens(data: bytes, offsets: List[int], pattern: re.Pattern) -> List[int]:
+	"""Token indices at which a new paragraph/sentence starts."""
+	out: List[int] = []
+	for m in pattern.finditer(data):
+		idx = bisect_left(offsets, m.end())
+		if 0 < idx < len(offsets) and (not out or out[-1] != idx):
+			out.append(idx)
+	return out
+
+
+def _last_boundary(boundaries: List[int], lo: int, hi: int) -> int:
+	"""Largest boundary in [lo, hi], or -1."""
+	pos = bisect_right(boundaries, hi) - 1
+	if pos >= 0 and boundaries[pos] >= lo:
+		return boundaries[pos]
+	return -1
+
+
+def _char_start(data: bytes, offset: int) -> int:
+	"""Move ``offset`` back to the first byte of the UTF-8 character it falls inside."""
+	while 0 < offset < len(data) and (data[offset] & 0xC0) == 0x80:
+		offset -= 1
+	return offset
+
+
+def iter_chunks(text: str, max_tokens: int = 400, overlap_tokens: int = 60) -> Iterator[str]:
+	"""Yield chunks of at most ``max_tokens`` tokens plus an ``overlap_tokens`` prefix.
+
+	The text is tokenized once; cuts are chosen on the token array, preferring
+	the last paragraph break in the window, then the last sentence break, then
+	a hard cut. Chunk text is sliced from the source bytes via the token
+	offsets, so chunks and overlaps are never re-encoded.
+	"""
 	text = normalize_whitespace(text)
-	if count_tokens(text) <= max_tokens:
-		return [text]
-
-	# Prefer to split by paragraphs, then sentences
-	paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-	chunks: List[str] = []
-	current: List[str] = []
-	current_tokens = 0
-
-	def flush() -> None:
-		nonlocal current, current_tokens
-		if not current:
-			return
-		joined = "\n".join(current).strip()
-		if joined:
-			chunks.append(joined)
-		current = []
-		current_tokens = 0
-
-	for para in paragraphs:
-		para_tokens = count_tokens(para)
-		if para_tokens > max_tokens:
-			# split paragraph into sentences heuristically
-			sentences = re.split(r"(?<=[.!?])\s+", para)
-			for sent in sentences:
-				sent = sent.strip()
-				if not sent:
-					continue
-				ts = count_tokens(sent)
-				if current_tokens + ts > max_tokens:
-					flush()
-				current.append(sent)
-				current_tokens += ts
-			else:
-				if current_tokens + para_tokens > max_tokens:
-					flush()
-				current.append(para)
-				current_tokens += para_tokens
-
-	flush()
-
-	# add overlaps
-	if overlap_tokens > 0 and chunks:
-		overlapped: List[str] = []
-		prev_tail = ""
-		for ch in chunks:
-			if prev_tail:
-				overlapped.append((prev_tail + "\n" + ch).strip())
-			else:
-				overlapped.append(ch)
-			# compute tail for next overlap
-			if ENC is None:
-				words = ch.split()
-				prev_tail = " ".join(words[-overlap_tokens:]) if words else ""
-			else:
-				ids = ENC.encode(ch)
-				tail_ids = ids[-overlap_tokens:]
-				prev_tail = ENC.decode(tail_ids)
-		return overlapped
-
-	return chunks
+	if not text:
+		return
+	data = text.encode("utf-8")
+	offsets = _token_offsets(data, text)
+	n = len(offsets)
+	if n <= max_tokens:
+		yield text
+		return
+
+	paragraphs = _boundary_tokens(data, offsets, _PARAGRAPH_RE)
+	sentences = _boundary_tokens(data, offsets, _SENTENCE_RE)
+	# Don't cut so early that chunks become fragments
+	min_tokens = max(1, max_tokens // 4)
+
+	start = 0
+	while start < n:
+		end = min(n, start + max_tokens)
+		if end < n:
+			cut = _last_boundary(paragraphs, start + min_tokens, end)
+			if cut < 0:
+				cut = _last_boundary(sentences, start + min_tokens, end)
+			if cut > start:
+				end = cut
+		head = max(0, start - overlap_tokens) if start > 0 and overlap_tokens > 0 else start
+		# Byte-level tokens can split a multibyte character; cut before it so no bytes are dropped
+		lo = _char_start(data, offsets[head])
+		hi = _char_start(data, offsets[end]) if end < n else len(data)
+		chunk = data[lo:hi].decode("utf-8").strip()
+		if chunk:
+			yield chunk
+		start = end
+
+
+def smart_chunk(text: str, max_tokens: int = 400, overlap_tokens: int = 60) -> List[str]:
+	return list(iter_chunks(text, max_tokens=max_tokens, overlap_tokens=overlap_tokens))
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+
+
+EMBED_CACHE_ENABLED = os.getenv("EMBED_CACHE", "true").lower() not in ("0", "false", "off", "no")
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "data/embed_cache.sqlite3")
+EMBED_CACHE_MEMORY_ITEMS = int(os.getenv("EMBED_CACHE_MEMORY_ITEMS", "4096"))
+EMBED_CACHE_DISK_MAX_MB = int(os.getenv("EMBED_CACHE_DISK_MAX_MB", "512"))
+
+
+def normalize_for_key(text: str) -> str:
+	return " ".join(text.split())
+
+
+def cache_key(model: str, text: str) -> Tuple[str, str]:
+	"""Content address of an embedding: (model, sha256 of the normalized text)."""
+	digest = hashlib.sha256(normalize_for_key(text).encode("utf-8")).hexdigest()
+	return model, digest
+
+
+def _pack(vector: List[float]) -> bytes:
+	return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+	vec = array("f")
+	vec.frombytes(blob)
+	return vec.tolist()
+
+
+class EmbeddingCache:
+	"""Two-tier embedding cache: in-process LRU in front of an optional SQLite store.
+
+	Vectors are stored on disk as packed float32 blobs. The disk tier is trimmed
+	by least-recent use once it grows past ``disk_max_bytes``.
+	"""
+
+	def __init__(
+		self,
+		path: Optional[str] = EMBED_CACHE_PATH,
+		memory_items: int = EMBED_CACHE_MEMORY_ITEMS,
+		disk_max_bytes: int = EMBED_CACHE_DISK_MAX_MB * 1024 * 1024,
+	) -> None:
+		self.memory_items = memory_items
+		self.disk_max_bytes = disk_max_bytes
+		self._memory: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+		self._lock = threading.Lock()
+		self._db: Optional[sqlite3.Connection] = None
+		self.memory_hits = 0
+		self.disk_hits = 0
+		self.misses = 0
+		self.evictions = 0
+		# Running size of the disk tier, so inserts don't rescan the table
+		self._disk_bytes = 0
+		if path:
+			try:
+				os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+				self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+				self._db.execute("PRAGMA journal_mode=WAL")
+				self._db.execute(
+					"CREATE TABLE IF NOT EXISTS embedding ("
+					" model TEXT NOT NULL, digest TEXT NOT NULL, vector BLOB NOT NULL,"
+					" size INTEGER NOT NULL, last_used REAL NOT NULL,"
+					" PRIMARY KEY (model, digest))"
+				)
+				self._db.execute("CREATE INDEX IF NOT EXISTS ix_embedding_last_used ON embedding(last_used)")
+				self._disk_bytes = self._stored_bytes()
+			except Exception as e:
+				logger.warning(f"Embedding disk cache unavailable at {path}: {e}; using memory tier only")
+				self._db = None
+
+	def _remember(self, key: Tuple[str, str], vector: List[float]) -> None:
+		self._memory[key] = vector
+		self._memory.move_to_end(key)
+		while len(self._memory) > self.memory_items:
+			self._memory.popitem(last=False)
+
+	def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+		keys = [cache_key(model, t) for t in texts]
+		out: List[Optional[List[float]]] = [None] * len(keys)
+		pending: Dict[str, List[int]] = {}
+		with self._lock:
+			for i, key in enumerate(keys):
+				vec = self._memory.get(key)
+				if vec is not None:
+					self._memory.move_to_end(key)
+					out[i] = vec
+					self.memory_hits += 1
+				else:
+					pending.setdefault(key[1], []).append(i)
+			if pending and self._db is not None:
+				now = time.time()
+				digests = list(pending)
+				for start in range(0, len(digests), 500):
+					part = digests[start : start + 500]
+					marks = ",".join("?" for _ in part)
+					rows = self._db.execute(
+						f"SELECT digest, vector FROM embedding WHERE model = ? AND digest IN ({marks})",
+						[model, *part],
+					).fetchall()
+					for digest, blob in rows:
+						vec = _unpack(blob)
+						self._remember((model, digest), vec)
+						for i in pending.pop(digest):
+							out[i] = vec
+							self.disk_hits += 1
+					if rows:
+						self._db.executemany(
+							"UPDATE embedding SET last_used = ? WHERE model = ? AND digest = ?",
+							[(now, model, digest) for digest, _ in rows],
+						)
+			self.misses += sum(len(v) for v in pending.values())
+		return out
+
+	def put_many(self, model: str, texts: List[str], vectors: List[List[float]]) -> None:
+		now = time.time()
+		by_digest: Dict[str, Tuple[str, str, bytes, int, float]] = {}
+		with self._lock:
+			for text, vec in zip(texts, vectors):
+				key = cache_key(model, text)
+				self._remember(key, vec)
+				blob = _pack(vec)
+				by_digest[key[1]] = (model, key[1], blob, len(blob), now)
+			rows = list(by_digest.values())
+			if self._db is None or not rows:
+				return
+			replaced = self._existing_bytes(model, [row[1] for row in rows])
+			self._db.executemany(
+				"INSERT OR REPLACE INTO embedding (model, digest, vector, size, last_used) VALUES (?, ?, ?, ?, ?)",
+				rows,
+			)
+			self._disk_bytes += sum(row[3] for row in rows) - replaced
+			if self._disk_bytes > self.disk_max_bytes:
+				self._evict_disk()
+
+	def _stored_bytes(self) -> int:
+		return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM embedding").fetchone()[0]
+
+	def _existing_bytes(self, model: str, digests: List[str]) -> int:
+		"""Size of the rows an INSERT OR REPLACE of ``digests`` is about to overwrite."""
+		total = 0
+		for start in range(0, len(digests), 500):
+			part = digests[start : start + 500]
+			marks = ",".join("?" for _ in part)
+			total += self._db.execute(
+				f"SELECT COALESCE(SUM(size), 0) FROM embedding WHERE model = ? AND digest IN ({marks})",
+				[model, *part],
+			).fetchone()[0]
+		return total
+
+	def _evict_disk(self) -> None:
+		# Other processes may share the file: re-read the true size before evicting
+		total = self._disk_bytes = self._stored_bytes()
+		if total <= self.disk_max_bytes:
+			return
+		# Trim down to 90% of the budget so we don't evict on every insert
+		excess = total - int(self.disk_max_bytes * 0.9)
+		victims = []
+		freed = 0
+		for model, digest, size in self._db.execute("SELECT model, digest, size FROM embedding ORDER BY last_used ASC"):
+			victims.append((model, digest))
+			freed += size
+			if freed >= excess:
+				break
+		self._db.executemany("DELETE FROM embedding WHERE model = ? AND digest = ?", victims)
+		self._disk_bytes -= freed
+		self.evictions += len(victims)
+		logger.info(f"Embedding cache evicted {len(victims)} vectors ({freed} bytes)")
+
+	def clear(self) -> None:
+		with self._lock:
+			self._memory.clear()
+			if self._db is not None:
+				self._db.execute("DELETE FROM embedding")
+				self._disk_bytes = 0
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			disk_items = self._db.execute("SELECT COUNT(*) FROM embedding").fetchone()[0] if self._db is not None else 0
+			lookups = self.memory_hits + self.disk_hits + self.misses
+			return {
+				"memory_hits": self.memory_hits,
+				"disk_hits": self.disk_hits,
+				"misses": self.misses,
+				"hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+				"evictions": self.evictions,
+				"memory_items": len(self._memory),
+				"disk_items": disk_items,
+			}
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+	"""Return the process-wide embedding cache, or None when EMBED_CACHE is disabled."""
+	global _cache
+	if not EMBED_CACHE_ENABLED:
+		return None
+	if _cache is None:
+		with _cache_lock:
+			if _cache is None:
+				_cache = EmbeddingCache()
+	return _cache
+
+
+def set_embedding_cache(cache: Optional[EmbeddingCache]) -> None:
+	"""Swap in a different cache implementation (anything with get_many/put_many/stats)."""
+	global _cache, EMBED_CACHE_ENABLED
+	_cache = cache
+	EMBED_CACHE_ENABLED = cache is not None
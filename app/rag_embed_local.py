@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import List
+import re
+import zlib
+
+try:
+	import numpy as np  # type: ignore
+	numpy_available = True
+except Exception:
+	numpy_available = False
+
+
+LOCAL_EMBED_DIM = 1536
+LOCAL_EMBED_MODEL = f"local-hashed-ngram-{LOCAL_EMBED_DIM}"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _features(text: str) -> List[str]:
+	"""Word unigrams, word bigrams and character trigrams of each word."""
+	words = _WORD_RE.findall(text.lower())
+	feats = [f"w:{w}" for w in words]
+	feats.extend(f"b:{a} {b}" for a, b in zip(words, words[1:]))
+	for w in words:
+		padded = f"<{w}>"
+		feats.extend(f"c:{padded[i : i + 3]}" for i in range(len(padded) - 2))
+	return feats
+
+
+def embed_local(texts: List[str], dim: int = LOCAL_EMBED_DIM) -> "np.ndarray":
+	"""Deterministic in-process embeddings via signed feature hashing.
+
+	Every n-gram is hashed (crc32, so stable across processes) to a bucket and
+	a sign; the whole batch is then scattered into one ``(len(texts), dim)``
+	matrix, given sublinear tf weighting and L2-normalized row-wise.
+	"""
+	if not numpy_available:
+		raise RuntimeError("numpy is required for EMBED_BACKEND=local")
+	rows: List[int] = []
+	hashes: List[int] = []
+	for i, t in enumerate(texts):
+		feats = _features(t)
+		rows.extend([i] * len(feats))
+		hashes.extend(zlib.crc32(f.encode("utf-8")) for f in feats)
+
+	mat = np.zeros((len(texts), dim), dtype=np.float32)
+	if hashes:
+		h = np.asarray(hashes, dtype=np.uint32)
+		cols = (h % dim).astype(np.intp)
+		signs = np.where((h >> 31) & 1, -1.0, 1.0).astype(np.float32)
+		np.add.at(mat, (np.asarray(rows, dtype=np.intp), cols), signs)
+	# Sublinear tf keeps frequent n-grams from dominating, preserving sign
+	mat = np.sign(mat) * np.log1p(np.abs(mat))
+	norms = np.linalg.norm(mat, axis=1, keepdims=True)
+	np.divide(mat, norms, out=mat, where=norms > 0)
+	return mat
@@ -1,31 +1,112 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Dict, Optional, Tuple, Union
+import asyncio
 import os
+import random
+import threading
+import weakref
 
 from loguru import logger
 
+from .rag_embed_cache import get_embedding_cache
+from .rag_embed_local import LOCAL_EMBED_MODEL, embed_local
+
 try:
-	from openai import OpenAI
+	from openai import AsyncOpenAI, RateLimitError, APITimeoutError, APIConnectionError, InternalServerError
 	openai_available = True
+	_RETRYABLE: Tuple[type, ...] = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
 except Exception:
 	openai_available = False
+	_RETRYABLE = ()
 
 
 EMBED_MODEL = os.getenv("EMBED_MODEL", "text-embedding-3-small")
+# "openai" (remote API) or "local" (offline hashed n-gram embedder, see rag_embed_local)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "openai").lower()
+# Identity of the vector space this process embeds into; keys the embedding cache and ingest manifests
+EMBED_MODEL_ID = LOCAL_EMBED_MODEL if EMBED_BACKEND == "local" else EMBED_MODEL
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "100"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "5"))
 
 
 def _batched(items: List[str], batch_size: int) -> List[List[str]]:
 	return [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
 
 
-def embed_texts(texts: List[str]) -> List[List[float]]:
+# One AsyncOpenAI client per event loop: its HTTP connection pool cannot be shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+# Likewise one semaphore per loop, so EMBED_CONCURRENCY bounds all concurrent callers together
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_async_client() -> "AsyncOpenAI":
 	if not openai_available:
 		raise RuntimeError("openai package not available; ensure requirements are installed")
 	api_key = os.getenv("OPENAI_API_KEY")
 	if not api_key:
 		raise RuntimeError("OPENAI_API_KEY is required for embedding")
+	loop = asyncio.get_running_loop()
+	client = _clients.get(loop)
+	if client is None:
+		# Retries are handled here so they respect the shared semaphore
+		client = AsyncOpenAI(api_key=api_key, max_retries=0)
+		_clients[loop] = client
+	return client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+	loop = asyncio.get_running_loop()
+	sem = _semaphores.get(loop)
+	if sem is None:
+		sem = asyncio.Semaphore(max(1, EMBED_CONCURRENCY))
+		_semaphores[loop] = sem
+	return sem
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+	"""Event loop thread that serves sync callers, so they share one client and its connections."""
+	global _loop
+	with _loop_lock:
+		if _loop is None or _loop.is_closed():
+			_loop = asyncio.new_event_loop()
+			threading.Thread(target=_loop.run_forever, name="embed-loop", daemon=True).start()
+	return _loop
 
+
+async def _embed_batch(client: "AsyncOpenAI", batch: List[str], sem: asyncio.Semaphore) -> List[List[float]]:
+	async with sem:
+		for attempt in range(EMBED_MAX_RETRIES + 1):
+			try:
+				resp = await client.embeddings.create(model=EMBED_MODEL, input=batch)
+				return [item.embedding for item in sorted(resp.data, key=lambda d: d.index)]
+			except _RETRYABLE as e:
+				if attempt >= EMBED_MAX_RETRIES:
+					logger.exception("Embedding batch failed after retries")
+					raise
+				delay = min(30.0, 2 ** attempt) + random.uniform(0, 0.5)
+				logger.warning(f"Embedding batch of {len(batch)} throttled/failed ({type(e).__name__}); retrying in {delay:.1f}s")
+				await asyncio.sleep(delay)
+			except Exception:
+				logger.exception("Embedding batch failed")
+				raise
+	raise RuntimeError("unreachable")
+
+
+async def _embed_uncached(texts: List[str]) -> List[List[float]]:
+	client = _get_async_client()
+	sem = _get_semaphore()
+	results = await asyncio.gather(*[_embed_batch(client, b, sem) for b in _batched(texts, EMBED_BATCH_SIZE)])
+	out: List[List[float]] = []
+	for vecs in results:
+		out.extend(vecs)
+	return out
+
+
+def _sanitize(texts: List[str]) -> Tuple[List[str], List[int]]:
 	# sanitize inputs: ensure non-empty strings
 	clean_texts: List[str] = []
 	index_map: List[int] = []
@@ -39,16 +120,77 @@ def embed_texts(texts: List[str]) -> List[List[float]]:
 		index_map.append(idx)
 	if not clean_texts:
 		raise ValueError("No non-empty text chunks to embed")
+	return clean_texts, index_map
+
 
-	client = OpenAI(api_key=api_key)
-	embeddings: List[List[float]] = []
-	for batch in _batched(clean_texts, batch_size=100):
-		try:
-			resp = client.embeddings.create(model=EMBED_MODEL, input=batch)
-			embeddings.extend([item.embedding for item in resp.data])
-		except Exception as e:
-			logger.exception("Embedding batch failed")
-			raise
-
-	# Re-expand to original order; callers using filtered indices should align accordingly
+def _embed_local_aligned(texts: List[str]) -> List[Optional[List[float]]]:
+	clean_texts, index_map = _sanitize(texts)
+	embeddings: List[Optional[List[float]]] = [None] * len(texts)
+	for pos, vec in enumerate(embed_local(clean_texts).tolist()):
+		embeddings[index_map[pos]] = vec
 	return embeddings
+
+
+async def embed_texts_async(texts: List[str]) -> List[Optional[List[float]]]:
+	"""Embed texts with concurrent batches; the result is aligned with ``texts``.
+
+	Inputs that are not non-empty strings are dropped from the request and
+	come back as None at their original position.
+	"""
+	if EMBED_BACKEND == "local":
+		return _embed_local_aligned(texts)
+	clean_texts, index_map = _sanitize(texts)
+
+	cache = get_embedding_cache()
+	cached = cache.get_many(EMBED_MODEL_ID, clean_texts) if cache is not None else [None] * len(clean_texts)
+	# Only send unique cache misses to the API
+	missing: List[str] = []
+	seen: Dict[str, int] = {}
+	for s, vec in zip(clean_texts, cached):
+		if vec is None and s not in seen:
+			seen[s] = len(missing)
+			missing.append(s)
+
+	fresh: List[List[float]] = []
+	if missing:
+		fresh = await _embed_uncached(missing)
+		if cache is not None:
+			cache.put_many(EMBED_MODEL_ID, missing, fresh)
+	logger.debug(f"Embedded {len(clean_texts)} texts: {len(clean_texts) - sum(1 for v in cached if v is None)} cached, {len(missing)} via API")
+
+	# Re-expand to original order so dropped inputs stay aligned
+	embeddings: List[Optional[List[float]]] = [None] * len(texts)
+	for pos, (s, vec) in enumerate(zip(clean_texts, cached)):
+		embeddings[index_map[pos]] = vec if vec is not None else fresh[seen[s]]
+	return embeddings
+
+
+def embed_texts(texts: List[str]) -> List[Optional[List[float]]]:
+	"""Blocking wrapper around embed_texts_async for sync callers (ingest, orchestrator)."""
+	if EMBED_BACKEND == "local":
+		return _embed_local_aligned(texts)
+	future = asyncio.run_coroutine_threadsafe(embed_texts_async(texts), _background_loop())
+	return future.result()
+
+
+async def embed_batches_async(batches: List[List[str]]) -> List[Union[List[Optional[List[float]]], BaseException]]:
+	"""Embed several batches concurrently, isolating failures per batch.
+
+	Each entry of the result is either the aligned vectors for that batch or
+	the exception that batch raised.
+	"""
+	return await asyncio.gather(*[embed_texts_async(b) for b in batches], return_exceptions=True)
+
+
+def embed_batches(batches: List[List[str]]) -> List[Union[List[Optional[List[float]]], BaseException]]:
+	"""Blocking wrapper around embed_batches_async."""
+	if EMBED_BACKEND == "local":
+		out: List[Union[List[Optional[List[float]]], BaseException]] = []
+		for b in batches:
+			try:
+				out.append(_embed_local_aligned(b))
+			except Exception as e:
+				out.append(e)
+		return out
+	future = asyncio.run_coroutine_threadsafe(embed_batches_async(batches), _background_loop())
+	return future.result()
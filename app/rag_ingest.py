@@ -2,14 +2,14 @@ from __future__ import annotations
 
 from typing import List, Dict, Tuple
 import os
-import uuid
 
 import docx2txt  # type: ignore
 from loguru import logger
 
 from .rag_chunking import smart_chunk
-from .rag_embeddings import embed_texts
-from .rag_qdrant import QdrantStore
+from .rag_embeddings import embed_texts, EMBED_BATCH_SIZE, EMBED_CONCURRENCY, EMBED_MODEL_ID
+from .rag_manifest import IngestManifest, content_hash, point_id
+from .rag_qdrant import get_store
 
 
 def load_docx_text(path: str) -> str:
@@ -42,24 +42,50 @@ def _ingest_text(text: str, source: str, path: str, collection: str = None) -> D
 	if not filtered:
 		raise ValueError("No non-empty chunks produced from document")
 	logger.info(f"Chunked into {len(chunks)} parts, {len(filtered)} non-empty")
-	try:
-		vectors = embed_texts(filtered)
-	except Exception as e:
-		logger.warning(f"Embedding failed for document {path}: {e}; skipping ingest")
-		return {"chunks": 0, "upserted": 0}
-	store = QdrantStore(collection=collection) if collection else QdrantStore()
-	ids = [str(uuid.uuid4()) for _ in filtered]
-	payloads: List[Dict] = []
-	for out_pos, ch in enumerate(filtered):
-		orig_idx = idxs[out_pos]
-		payloads.append({
-			"text": ch,
-			"source": source,
-			"chunk_index": orig_idx,
-			"path": path,
-		})
-	store.upsert(ids=ids, vectors=vectors, payloads=payloads)
-	return {"chunks": len(filtered), "upserted": len(ids)}
+	store = get_store(collection) if collection else get_store()
+	manifest = IngestManifest(store.collection, EMBED_MODEL_ID)
+	manifest.check_collection(store.points_count())
+	previous = manifest.points_for(path)
+
+	hashes = [content_hash(ch) for ch in filtered]
+	ids = [point_id(path, str(idxs[pos]), hashes[pos], EMBED_MODEL_ID) for pos in range(len(filtered))]
+	new_pos = [pos for pos, pid in enumerate(ids) if pid not in previous]
+	current = set(ids)
+	stale = [pid for pid in previous if pid not in current]
+	logger.info(f"{len(new_pos)} new/changed chunks, {len(filtered) - len(new_pos)} unchanged, {len(stale)} vanished")
+
+	# Embed in windows and stream each window to Qdrant while the next one is embedded
+	window = EMBED_BATCH_SIZE * max(1, EMBED_CONCURRENCY)
+	ingested: Dict[str, str] = {pid: h for pid, h in zip(ids, hashes) if pid in previous}
+	failed = False
+	with store.upserter() as upserter:
+		for start in range(0, len(new_pos), window):
+			part = new_pos[start : start + window]
+			try:
+				vectors = embed_texts([filtered[pos] for pos in part])
+			except Exception as e:
+				logger.warning(f"Embedding failed for document {path}: {e}; stopping ingest after {upserter.sent} chunks")
+				failed = True
+				break
+			for pos, vec in zip(part, vectors):
+				upserter.add(ids[pos], vec, {
+					"text": filtered[pos],
+					"source": source,
+					"chunk_index": idxs[pos],
+					"path": path,
+					"content_hash": hashes[pos],
+				})
+				ingested[ids[pos]] = hashes[pos]
+	upserted = upserter.sent
+	if failed:
+		# Keep vanished points until a run completes so a partial ingest never loses data
+		stale = []
+		ingested = {**previous, **ingested}
+	else:
+		store.delete(stale)
+	manifest.replace(path, ingested)
+	manifest.save()
+	return {"chunks": len(filtered), "upserted": upserted, "unchanged": len(filtered) - len(new_pos), "deleted": len(stale)}
 
 
 def ingest_docx_to_qdrant(path: str, source: str = "knowledge_base", collection: str = None) -> Dict[str, int]:
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import uuid
+
+import portalocker
+from loguru import logger
+
+
+RAG_MANIFEST_DIR = os.getenv("RAG_MANIFEST_DIR", "data/ingest_manifests")
+
+# Fixed namespace so point ids are stable across processes and hosts
+POINT_NAMESPACE = uuid.UUID("6f1c7a52-3b8e-5d4a-9c1e-2a7f0d9e4b31")
+MANIFEST_VERSION = 2
+
+
+def content_hash(text: str) -> str:
+	return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def point_id(path: str, position: str, text_hash: str, embed_model: str) -> str:
+	"""Deterministic Qdrant point id: UUIDv5 of source path, row/chunk position, content hash and embedding model.
+
+	The model is part of the id so switching EMBED_MODEL/EMBED_BACKEND makes
+	every chunk new: it is re-embedded and its old-space point deleted as stale.
+	"""
+	return str(uuid.uuid5(POINT_NAMESPACE, f"{path}|{position}|{text_hash}|{embed_model}"))
+
+
+class IngestManifest:
+	"""Record of point ids (and their content hashes) ingested per (collection, source path).
+
+	Each source also records the embedding model its vectors came from, so an
+	ingest under another model warns about sources still in the old space.
+
+	Stored as one JSON file per collection under RAG_MANIFEST_DIR. It is only
+	an optimization: ids are deterministic, so a lost manifest costs a re-embed
+	and re-upsert, never duplicate points.
+
+	``save`` merges this instance's sources into the file as it is on disk,
+	under a file lock, so concurrent ingests of different sources into one
+	collection keep each other's entries.
+	"""
+
+	_lock = threading.Lock()
+
+	def __init__(self, collection: str, embed_model: str, directory: Optional[str] = None) -> None:
+		self.collection = collection
+		self.embed_model = embed_model
+		self.path = os.path.join(directory or RAG_MANIFEST_DIR, f"{collection}.json")
+		self._data, self._models = self._read()
+		self._replaced: Dict[str, Dict[str, str]] = {}
+		self._reset = False
+		stale = sorted(p for p in self._data if self._models.get(p) != embed_model)
+		if stale:
+			logger.warning(f"Collection {collection} holds sources embedded with another model than {embed_model}; searches over them are unreliable until they are re-ingested: {stale}")
+
+	def _read(self) -> Tuple[Dict[str, Dict[str, str]], Dict[str, str]]:
+		if not os.path.exists(self.path):
+			return {}, {}
+		try:
+			with open(self.path, "r", encoding="utf-8") as f:
+				raw = json.load(f)
+		except Exception as e:
+			logger.warning(f"Ignoring unreadable ingest manifest {self.path}: {e}")
+			return {}, {}
+		if raw.get("version") != MANIFEST_VERSION:
+			# Pre-model manifest: {source: points}, embedding model unknown
+			return raw, {}
+		return raw["sources"], raw["models"]
+
+	def recorded_points(self) -> int:
+		return sum(len(points) for points in self._data.values())
+
+	def check_collection(self, points_count: int) -> bool:
+		"""Drop the manifest if the collection holds fewer points than it records.
+
+		That means the collection was wiped or recreated since the manifest was
+		written; trusting it would skip every chunk as unchanged.
+		"""
+		recorded = self.recorded_points()
+		if recorded <= points_count:
+			return True
+		logger.warning(f"Collection {self.collection} has {points_count} points but the ingest manifest records {recorded}; discarding manifest")
+		self._data = {}
+		self._models = {}
+		self._replaced = {}
+		self._reset = True
+		return False
+
+	def points_for(self, source_path: str) -> Dict[str, str]:
+		return dict(self._data.get(source_path, {}))
+
+	def replace(self, source_path: str, points: Dict[str, str]) -> None:
+		self._data[source_path] = dict(points)
+		self._replaced[source_path] = dict(points)
+
+	def save(self) -> None:
+		directory = os.path.dirname(self.path) or "."
+		os.makedirs(directory, exist_ok=True)
+		with self._lock, portalocker.Lock(f"{self.path}.lock", timeout=60):
+			data, models = ({}, {}) if self._reset else self._read()
+			data.update(self._replaced)
+			models.update({p: self.embed_model for p in self._replaced})
+			fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{self.collection}.", suffix=".tmp")
+			try:
+				with os.fdopen(fd, "w", encoding="utf-8") as f:
+					json.dump({"version": MANIFEST_VERSION, "sources": data, "models": models}, f)
+				os.replace(tmp, self.path)
+			except BaseException:
+				os.unlink(tmp)
+				raise
+			self._data, self._models = data, models
+			self._replaced = {}
+			self._reset = False
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import concurrent.futures
+import math
 import os
+import threading
 
 from loguru import logger
 from qdrant_client import QdrantClient
@@ -9,42 +12,120 @@ from qdrant_client.http import models as qmodels
 
 
 DEFAULT_COLLECTION = os.getenv("QDRANT_COLLECTION", "imperial_court_kb")
+VECTOR_SIZE = 1536
+UPSERT_BATCH_SIZE = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+UPSERT_MAX_IN_FLIGHT = int(os.getenv("QDRANT_UPSERT_MAX_IN_FLIGHT", "2"))
+
+# Process-wide registries: one long-lived client per (url, api_key) and one
+# verified store per (url, collection), so the hot path only pays for the query itself.
+_clients: Dict[Tuple[str, Optional[str]], QdrantClient] = {}
+_stores: Dict[Tuple[str, str], "QdrantStore"] = {}
+_collection_meta: Dict[Tuple[str, str], qmodels.VectorParams] = {}
+_registry_lock = threading.RLock()
+
+
+def _qdrant_url() -> str:
+	api_url = os.getenv("QDRANT_URL")
+	if not api_url:
+		raise RuntimeError("QDRANT_URL is required (create a free cluster in Qdrant Cloud)")
+	return api_url
+
+
+def get_qdrant_client(api_url: Optional[str] = None, api_key: Optional[str] = None) -> QdrantClient:
+	api_url = api_url or _qdrant_url()
+	api_key = api_key if api_key is not None else os.getenv("QDRANT_API_KEY")
+	key = (api_url, api_key)
+	with _registry_lock:
+		client = _clients.get(key)
+		if client is None:
+			client = QdrantClient(url=api_url, api_key=api_key, timeout=60.0)
+			_clients[key] = client
+		return client
+
+
+def get_store(collection: str = DEFAULT_COLLECTION) -> "QdrantStore":
+	"""Return the shared QdrantStore for ``collection`` on the configured cluster."""
+	key = (_qdrant_url(), collection)
+	with _registry_lock:
+		store = _stores.get(key)
+		if store is None:
+			store = QdrantStore(collection=collection)
+			_stores[key] = store
+		return store
+
+
+def invalidate_collection_cache(collection: Optional[str] = None) -> None:
+	"""Forget verified collection metadata (all collections when ``collection`` is None).
+
+	Call this after a collection is dropped or recreated outside this process;
+	the next store access re-verifies it against the cluster.
+	"""
+	with _registry_lock:
+		for cache in (_collection_meta, _stores):
+			for key in [k for k in cache if collection is None or k[1] == collection]:
+				cache.pop(key, None)
 
 
 class QdrantStore:
 	def __init__(self, collection: str = DEFAULT_COLLECTION) -> None:
-		api_url = os.getenv("QDRANT_URL")
-		api_key = os.getenv("QDRANT_API_KEY")
-		if not api_url:
-			raise RuntimeError("QDRANT_URL is required (create a free cluster in Qdrant Cloud)")
-		self.client = QdrantClient(url=api_url, api_key=api_key, timeout=60.0)
+		self.api_url = _qdrant_url()
+		self.client = get_qdrant_client(self.api_url)
 		self.collection = collection
 		self._ensure_collection()
 
 	def _ensure_collection(self) -> None:
-		exists = False
-		try:
-			collections = self.client.get_collections().collections
-			exists = any(c.name == self.collection for c in collections)
-		except Exception:
-			logger.exception("Failed to list collections")
-		if exists:
-			return
-		logger.info(f"Creating Qdrant collection: {self.collection}")
-		self.client.create_collection(
-			collection_name=self.collection,
-			vectors_config=qmodels.VectorParams(size=1536, distance=qmodels.Distance.COSINE),
-		)
+		key = (self.api_url, self.collection)
+		with _registry_lock:
+			if key in _collection_meta:
+				return
+			params: Optional[qmodels.VectorParams] = None
+			try:
+				if self.client.collection_exists(self.collection):
+					vectors = self.client.get_collection(self.collection).config.params.vectors
+					params = vectors if isinstance(vectors, qmodels.VectorParams) else None
+					if params is not None and params.size != VECTOR_SIZE:
+						logger.warning(f"Qdrant collection {self.collection} has vector size {params.size}, expected {VECTOR_SIZE}")
+					_collection_meta[key] = params or qmodels.VectorParams(size=VECTOR_SIZE, distance=qmodels.Distance.COSINE)
+					return
+			except Exception:
+				logger.exception("Failed to inspect collection")
+			logger.info(f"Creating Qdrant collection: {self.collection}")
+			params = qmodels.VectorParams(size=VECTOR_SIZE, distance=qmodels.Distance.COSINE)
+			self.client.create_collection(collection_name=self.collection, vectors_config=params)
+			_collection_meta[key] = params
+
+	@property
+	def vector_params(self) -> Optional[qmodels.VectorParams]:
+		return _collection_meta.get((self.api_url, self.collection))
+
+	def points_count(self) -> int:
+		return self.client.count(collection_name=self.collection, exact=True).count
 
-	def upsert(self, ids: List[str], vectors: List[List[float]], payloads: List[Dict[str, Any]]) -> None:
+	def upsert(self, ids: List[str], vectors: List[List[float]], payloads: List[Dict[str, Any]], wait: bool = True) -> None:
 		assert len(ids) == len(vectors) == len(payloads)
-		self.client.upsert(
+		for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+			end = start + UPSERT_BATCH_SIZE
+			self.client.upsert(
+				collection_name=self.collection,
+				points=[qmodels.PointStruct(id=ids[i], vector=vectors[i], payload=payloads[i]) for i in range(start, min(end, len(ids)))],
+				wait=wait or end >= len(ids),
+			)
+
+	def delete(self, ids: List[str]) -> None:
+		if not ids:
+			return
+		self.client.delete(
 			collection_name=self.collection,
-			points=[qmodels.PointStruct(id=ids[i], vector=vectors[i], payload=payloads[i]) for i in range(len(ids))],
+			points_selector=qmodels.PointIdsList(points=list(ids)),
 		)
 
-	def search(self, vector: List[float], top_k: int = 5, filter_: Optional[qmodels.Filter] = None) -> List[Dict[str, Any]]:
-		res = self.client.search(collection_name=self.collection, query_vector=vector, limit=top_k, query_filter=filter_)
+	def upserter(self, batch_size: int = UPSERT_BATCH_SIZE, max_in_flight: int = UPSERT_MAX_IN_FLIGHT) -> "StreamingUpserter":
+		return StreamingUpserter(self, batch_size=batch_size, max_in_flight=max_in_flight)
+
+	def search(self, vector: List[float], top_k: int = 5, filter_: Optional[qmodels.Filter] = None, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+		"""``timeout`` (seconds, rounded up) overrides the client's 60s default for this query."""
+		options: Dict[str, Any] = {"timeout": max(1, math.ceil(timeout))} if timeout is not None else {}
+		res = self.client.search(collection_name=self.collection, query_vector=vector, limit=top_k, query_filter=filter_, **options)
 		out: List[Dict[str, Any]] = []
 		for p in res:
 			out.append({
@@ -54,3 +135,74 @@ class QdrantStore:
 				"meta": {k: v for k, v in p.payload.items() if k != "text"},
 			})
 		return out
+
+
+class StreamingUpserter:
+	"""Buffer points and upsert them in fixed-size batches on background threads.
+
+	At most ``max_in_flight`` batches are outstanding; ``add`` blocks once that
+	limit is hit, so a fast producer cannot grow memory without bound. Batches
+	are sent with ``wait=False`` and ``close`` finishes with a ``wait=True``
+	batch: Qdrant applies updates to a collection in order, so when it returns
+	every earlier batch is applied as well.
+	"""
+
+	def __init__(self, store: QdrantStore, batch_size: int = UPSERT_BATCH_SIZE, max_in_flight: int = UPSERT_MAX_IN_FLIGHT) -> None:
+		self.store = store
+		self.batch_size = max(1, batch_size)
+		self._slots = threading.BoundedSemaphore(max(1, max_in_flight))
+		self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="qdrant-upsert")
+		self._buffer: List[qmodels.PointStruct] = []
+		self._futures: List[concurrent.futures.Future] = []
+		self._error: Optional[BaseException] = None
+		self.sent = 0
+
+	def __enter__(self) -> "StreamingUpserter":
+		return self
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		if exc_type is None:
+			self.close()
+		else:
+			self._executor.shutdown(wait=True)
+
+	def _send(self, points: List[qmodels.PointStruct], wait: bool) -> None:
+		try:
+			self.store.client.upsert(collection_name=self.store.collection, points=points, wait=wait)
+		finally:
+			self._slots.release()
+
+	def _submit(self, wait: bool) -> None:
+		if self._error is not None:
+			raise self._error
+		points, self._buffer = self._buffer[: self.batch_size], self._buffer[self.batch_size :]
+		self._slots.acquire()
+		fut = self._executor.submit(self._send, points, wait)
+		fut.add_done_callback(self._on_done)
+		self._futures = [f for f in self._futures if not f.done()] + [fut]
+		self.sent += len(points)
+
+	def _on_done(self, fut: concurrent.futures.Future) -> None:
+		exc = fut.exception()
+		if exc is not None and self._error is None:
+			logger.error(f"Qdrant upsert batch failed for {self.store.collection}: {exc}")
+			self._error = exc
+
+	def add(self, point_id: str, vector: List[float], payload: Dict[str, Any]) -> None:
+		self._buffer.append(qmodels.PointStruct(id=point_id, vector=vector, payload=payload))
+		# Hold back one point so close() always has a final wait=True batch to send
+		if len(self._buffer) > self.batch_size:
+			self._submit(wait=False)
+
+	def close(self) -> int:
+		"""Flush the remaining points, wait for every batch and return the number of points sent."""
+		try:
+			concurrent.futures.wait(self._futures)
+			if self._buffer:
+				self._submit(wait=True)
+				concurrent.futures.wait(self._futures)
+		finally:
+			self._executor.shutdown(wait=True)
+		if self._error is not None:
+			raise self._error
+		return self.sent
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from loguru import logger
 
-from .job_manager import job_manager, JobInfo, JobStatus
+from .config import settings
+from .incident_dedup import incident_fingerprint
+from .job_manager import job_manager, BatchItem, JobInfo, JobStatus, TERMINAL_STATUSES
+from .run_events import FINAL_STATUSES, RunEventSubscription, format_sse
 
 router = APIRouter(prefix="/incident", tags=["incident"])
 
@@ -25,32 +29,125 @@ class RunResponse(BaseModel):
 	error: Optional[str] = None
 	progress: Optional[int] = None
 	current_step: Optional[str] = None
+	# Set when the incident matched a recent run and was attached to it instead of enqueued
+	deduplicated: bool = False
+	duplicate_match: Optional[str] = None
+
+
+class JobSummary(BaseModel):
+	"""Listing projection of a run; the full result is only served by GET /incident/run/{run_id}."""
+	run_id: str
+	status: str
+	created_at: datetime
+	started_at: Optional[datetime] = None
+	completed_at: Optional[datetime] = None
+	error: Optional[str] = None
+	progress: Optional[int] = None
+	current_step: Optional[str] = None
+	incident_text: Optional[str] = None
 
 
 class JobListResponse(BaseModel):
-	jobs: List[RunResponse]
+	jobs: List[JobSummary]
+	# Pass back as ?cursor= for the next (older) page; null when there are no more jobs
+	next_cursor: Optional[str] = None
+
+
+class BatchIncidentRequest(BaseModel):
+	incidents: List[IncidentRequest] = Field(..., min_length=1)
+
+
+class BatchRunItem(BaseModel):
+	run_id: str
+	deduplicated: bool = False
+	duplicate_match: Optional[str] = None
+
+
+class BatchRunResponse(BaseModel):
+	group_id: str
+	# Aligned with the submitted incidents; repeats share a run_id
+	run_ids: List[str]
+	runs: List[BatchRunItem]
+
+
+class BatchStatusResponse(BaseModel):
+	group_id: str
+	total: int
+	# Run count per status, e.g. {"queued": 2, "processing": 1, "completed": 5}
+	statuses: Dict[str, int]
+	# Mean progress over the batch's runs; failed runs count as done
+	progress: int
+	finished: bool
+	jobs: List[JobSummary]
+
+
+def _incident_text(request: IncidentRequest) -> str:
+	return f"Incident Type: {request.incident_type}\nSeverity: {request.severity}\nDetails: {request.payload}"
+
+
+async def _incident_vectors(incident_texts: List[str]) -> List[Optional[List[float]]]:
+	"""Embeddings used for near-duplicate detection, when enabled (one request for all texts)."""
+	if settings.incident_dedup_similarity is None:
+		return [None] * len(incident_texts)
+	try:
+		from .rag_embeddings import embed_texts_async
+		return await embed_texts_async(incident_texts)
+	except Exception as e:
+		logger.warning(f"Near-duplicate check skipped, embedding failed: {e}")
+		return [None] * len(incident_texts)
+
+
+async def _incident_vector(incident_text: str) -> Optional[List[float]]:
+	return (await _incident_vectors([incident_text]))[0]
+
+
+def _job_summary(job_info: JobInfo) -> JobSummary:
+	return JobSummary(
+		run_id=job_info.run_id,
+		status=job_info.status.value,
+		created_at=job_info.created_at,
+		started_at=job_info.started_at,
+		completed_at=job_info.completed_at,
+		error=job_info.error,
+		progress=job_info.progress,
+		current_step=job_info.current_step,
+		incident_text=job_info.incident_text
+	)
 
 
 @router.post("/run", response_model=RunResponse)
-async def run_incident(request: IncidentRequest):
-	"""Submit an incident for background processing and return a run_id."""
+async def run_incident(request: IncidentRequest, dedup: bool = True):
+	"""Submit an incident for background processing and return a run_id.
+
+	Repeats of a recent incident attach to its run_id (``deduplicated``) unless ``dedup=false``.
+	"""
 	logger.info("🚨 NEW INCIDENT RECEIVED via API")
 	logger.info(f"📝 Incident Type: {request.incident_type}")
 	logger.info(f"⚖️  Severity: {request.severity}")
 	logger.info(f"📊 Payload: {str(request.payload)[:100]}{'...' if len(str(request.payload)) > 100 else ''}")
 	
 	# Convert structured request to incident text for the orchestrator
-	incident_text = f"Incident Type: {request.incident_type}\nSeverity: {request.severity}\nDetails: {request.payload}"
+	incident_text = _incident_text(request)
+	fingerprint = incident_fingerprint(request.incident_type, request.severity, request.payload)
 	
 	try:
-		# Submit job to background processing
-		run_id = job_manager.submit_job(incident_text)
+		vector = await _incident_vector(incident_text) if dedup else None
+		if dedup:
+			# Claims the fingerprint atomically, so concurrent repeats share one run
+			run_id, match = job_manager.submit_or_attach(incident_text, fingerprint, vector)
+		else:
+			run_id = job_manager.submit_job(incident_text, fingerprint=fingerprint, vector=vector)
+			match = None
+		duplicate = match is not None
+		if duplicate:
+			logger.info(f"🔁 DUPLICATE INCIDENT ({match}) attached to existing run - Run ID: {run_id}")
 		job_info = job_manager.get_job_status(run_id)
 		
 		if not job_info:
 			raise HTTPException(status_code=500, detail="Failed to create job")
 		
-		logger.info(f"✅ INCIDENT SUBMITTED for background processing - Run ID: {run_id}")
+		if not duplicate:
+			logger.info(f"✅ INCIDENT SUBMITTED for background processing - Run ID: {run_id}")
 		
 		return RunResponse(
 			run_id=job_info.run_id,
@@ -61,14 +158,88 @@ async def run_incident(request: IncidentRequest):
 			result=job_info.result,
 			error=job_info.error,
 			progress=job_info.progress,
-			current_step=job_info.current_step
+			current_step=job_info.current_step,
+			deduplicated=duplicate,
+			duplicate_match=match
 		)
 		
+	except HTTPException:
+		raise
 	except Exception as e:
 		logger.error(f"❌ INCIDENT SUBMISSION FAILED: {str(e)}")
 		raise HTTPException(status_code=500, detail=f"Incident submission failed: {str(e)}")
 
 
+@router.post("/run/batch", response_model=BatchRunResponse)
+async def run_incident_batch(request: BatchIncidentRequest, dedup: bool = True):
+	"""Submit a burst of incidents as one Celery group and return their run_ids plus a pollable group_id.
+
+	The whole batch is validated before anything is enqueued. Repeats of a recent
+	incident, or of one earlier in the batch, attach to that run unless ``dedup=false``.
+	"""
+	incidents = request.incidents
+	logger.info(f"🚨 INCIDENT BATCH RECEIVED via API: {len(incidents)} incidents")
+	
+	if len(incidents) > settings.incident_batch_max_size:
+		raise HTTPException(
+			status_code=422,
+			detail=f"Batch of {len(incidents)} incidents exceeds the limit of {settings.incident_batch_max_size}"
+		)
+	
+	incident_texts = [_incident_text(incident) for incident in incidents]
+	try:
+		vectors = await _incident_vectors(incident_texts) if dedup else [None] * len(incidents)
+		items = [
+			BatchItem(
+				incident_text=text,
+				fingerprint=incident_fingerprint(incident.incident_type, incident.severity, incident.payload),
+				vector=vector
+			)
+			for incident, text, vector in zip(incidents, incident_texts, vectors)
+		]
+		group_id, runs = job_manager.submit_batch(items, dedup=dedup)
+	except Exception as e:
+		logger.error(f"❌ INCIDENT BATCH SUBMISSION FAILED: {str(e)}")
+		raise HTTPException(status_code=500, detail=f"Incident batch submission failed: {str(e)}")
+	
+	logger.info(f"✅ INCIDENT BATCH SUBMITTED - Group ID: {group_id}")
+	
+	return BatchRunResponse(
+		group_id=group_id,
+		run_ids=[run_id for run_id, _ in runs],
+		runs=[
+			BatchRunItem(run_id=run_id, deduplicated=match is not None, duplicate_match=match)
+			for run_id, match in runs
+		]
+	)
+
+
+@router.get("/run/batch/{group_id}", response_model=BatchStatusResponse)
+async def get_run_batch(group_id: str):
+	"""Aggregate status and progress of a batch submission."""
+	logger.info(f"📋 Batch status requested for: {group_id}")
+	
+	jobs = job_manager.get_batch(group_id)
+	if jobs is None:
+		logger.warning(f"❓ Batch not found: {group_id}")
+		raise HTTPException(status_code=404, detail="Batch not found")
+	
+	statuses: Dict[str, int] = {}
+	for job_info in jobs:
+		statuses[job_info.status.value] = statuses.get(job_info.status.value, 0) + 1
+	done = sum(1 for job_info in jobs if job_info.status in TERMINAL_STATUSES)
+	progress_total = sum(100 if job_info.status in TERMINAL_STATUSES else (job_info.progress or 0) for job_info in jobs)
+	
+	return BatchStatusResponse(
+		group_id=group_id,
+		total=len(jobs),
+		statuses=statuses,
+		progress=progress_total // len(jobs) if jobs else 100,
+		finished=done == len(jobs),
+		jobs=[_job_summary(job_info) for job_info in jobs]
+	)
+
+
 @router.get("/run/{run_id}", response_model=RunResponse)
 async def get_run(run_id: str):
 	"""Get the status and results of a background job."""
@@ -94,28 +265,76 @@ async def get_run(run_id: str):
 	)
 
 
-@router.get("/jobs", response_model=JobListResponse)
-async def list_jobs(limit: int = 20):
-	"""List recent jobs with their status."""
-	logger.info(f"📋 Listing recent jobs (limit: {limit})")
+@router.get("/run/{run_id}/events")
+async def stream_run_events(run_id: str, request: Request, keepalive: float = 15.0):
+	"""Stream progress of a run as Server-Sent Events until it completes or fails.
+
+	The first event is the current snapshot; later ones are pushed by the worker.
+	"""
+	logger.info(f"📡 Event stream requested for: {run_id}")
+	
+	if not job_manager.get_job_status(run_id):
+		logger.warning(f"❓ Run not found: {run_id}")
+		raise HTTPException(status_code=404, detail="Run not found")
 	
-	jobs = job_manager.list_jobs(limit=limit)
-	job_responses = []
+	async def event_stream():
+		async with RunEventSubscription(run_id) as subscription:
+			# Snapshot after subscribing so no update published in between is lost
+			job_info = job_manager.get_job_status(run_id)
+			if not job_info:
+				return
+			snapshot = {
+				"run_id": run_id,
+				"status": job_info.status.value,
+				"progress": job_info.progress,
+				"current_step": job_info.current_step,
+				"error": job_info.error,
+			}
+			yield format_sse(snapshot)
+			if snapshot["status"] in FINAL_STATUSES:
+				return
+			while not await request.is_disconnected():
+				event = await subscription.next_event(timeout=keepalive)
+				if event is None:
+					yield ": keepalive\n\n"
+					continue
+				yield format_sse(event)
+				if event.get("status") in FINAL_STATUSES:
+					return
 	
-	for job_info in jobs.values():
-		job_responses.append(RunResponse(
-			run_id=job_info.run_id,
-			status=job_info.status.value,
-			created_at=job_info.created_at,
-			started_at=job_info.started_at,
-			completed_at=job_info.completed_at,
-			result=job_info.result,
-			error=job_info.error,
-			progress=job_info.progress,
-			current_step=job_info.current_step
-		))
+	return StreamingResponse(
+		event_stream(),
+		media_type="text/event-stream",
+		headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+	)
+
+
+@router.get("/jobs", response_model=JobListResponse)
+async def list_jobs(
+	limit: int = Query(20, ge=1, le=200),
+	cursor: Optional[str] = None,
+	status: Optional[List[JobStatus]] = Query(None),
+	created_after: Optional[datetime] = None,
+	created_before: Optional[datetime] = None
+):
+	"""List jobs newest first as summaries (no result), one page at a time.
+
+	Filter by ``status`` (repeatable) and a ``created_after``/``created_before`` range.
+	"""
+	logger.info(f"📋 Listing jobs (limit: {limit}, status: {status}, cursor: {cursor})")
 	
-	return JobListResponse(jobs=job_responses)
+	try:
+		jobs, next_cursor = job_manager.page_jobs(
+			limit=limit,
+			cursor=cursor,
+			statuses=status,
+			created_after=created_after,
+			created_before=created_before
+		)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	
+	return JobListResponse(jobs=[_job_summary(job_info) for job_info in jobs], next_cursor=next_cursor)
 
 
 @router.post("/cleanup")
@@ -123,11 +342,8 @@ async def cleanup_old_jobs(max_age_hours: int = 24):
 	"""Clean up old completed/failed jobs."""
 	logger.info(f"🧹 Cleaning up jobs older than {max_age_hours} hours")
 	
-	initial_count = len(job_manager._jobs)
-	job_manager.cleanup_old_jobs(max_age_hours=max_age_hours)
-	final_count = len(job_manager._jobs)
-	
-	cleaned_count = initial_count - final_count
+	cleaned_count = job_manager.cleanup_old_jobs(max_age_hours=max_age_hours)
+	final_count = job_manager.count_jobs()
 	logger.info(f"🧹 Cleaned up {cleaned_count} old jobs")
 	
 	return {"message": f"Cleaned up {cleaned_count} old jobs", "remaining_jobs": final_count}
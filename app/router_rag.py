@@ -5,8 +5,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from .rag_ingest import ingest_docx_to_qdrant, ingest_text_to_qdrant
-from .rag_embeddings import embed_texts
-from .rag_qdrant import QdrantStore
+from .rag_embeddings import embed_texts_async
+from .rag_embed_cache import get_embedding_cache
+from .rag_qdrant import get_store
 from .rag_cases import ingest_cases_excel, ingest_cases_csv
 
 router = APIRouter(prefix="/rag", tags=["rag"])
@@ -16,6 +17,8 @@ class IngestResponse(BaseModel):
 	chunks: int
 	upserted: int
 	rows: int | None = None
+	unchanged: int | None = None
+	deleted: int | None = None
 
 
 class SearchRequest(BaseModel):
@@ -50,7 +53,7 @@ async def ingest_parsed_kb() -> IngestResponse:
 async def ingest_cases() -> IngestResponse:
 	try:
 		stats = ingest_cases_excel("data/Case Log.xlsx")
-		return IngestResponse(chunks=stats["chunks"], upserted=stats["upserted"], rows=stats["rows"])
+		return IngestResponse(**stats)
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
 
@@ -64,7 +67,7 @@ async def ingest_cases_csv_endpoint() -> IngestResponse:
 		path = str(clean if clean.exists() else orig)
 		# Use dedicated collection for case history
 		stats = ingest_cases_csv(path, collection="imperial_court_case_history")
-		return IngestResponse(chunks=stats["chunks"], upserted=stats["upserted"], rows=stats["rows"])
+		return IngestResponse(**stats)
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
 
@@ -72,9 +75,17 @@ async def ingest_cases_csv_endpoint() -> IngestResponse:
 @router.post("/search", response_model=SearchResult)
 async def rag_search(req: SearchRequest) -> SearchResult:
 	try:
-		vec = embed_texts([req.query])[0]
-		store = QdrantStore()
+		vec = (await embed_texts_async([req.query]))[0]
+		store = get_store()
 		hits = store.search(vector=vec, top_k=req.top_k)
 		return SearchResult(results=hits)
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/embed_cache/stats")
+async def embed_cache_stats() -> Dict[str, Any]:
+	cache = get_embedding_cache()
+	if cache is None:
+		return {"enabled": False}
+	return {"enabled": True, **cache.stats()}
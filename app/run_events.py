@@ -0,0 +1,99 @@
+"""
+Push-based progress events for incident runs over Redis pub/sub.
+
+Celery workers publish every progress update to ``imperial:run_events:<run_id>``;
+the API relays that channel to clients as Server-Sent Events.
+"""
+import asyncio
+import json
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+from loguru import logger
+
+from .celery_config import redis_url
+from .job_manager import TERMINAL_STATUSES
+
+
+CHANNEL_PREFIX = "imperial:run_events:"
+# Statuses after which a run emits nothing further
+FINAL_STATUSES = tuple(status.value for status in TERMINAL_STATUSES)
+
+_publisher: Optional["redis.Redis"] = None
+# One async client (and connection pool) per event loop, shared by every SSE subscription in it
+_subscribers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = weakref.WeakKeyDictionary()
+
+
+def run_channel(run_id: str) -> str:
+    return f"{CHANNEL_PREFIX}{run_id}"
+
+
+def publish_run_event(run_id: str, status: str, progress: Optional[int] = None, current_step: Optional[str] = None, **extra: Any) -> None:
+    """Publish a progress event for ``run_id``; failures are logged, never raised into the task."""
+    global _publisher
+    event = {"run_id": run_id, "status": status, "progress": progress, "current_step": current_step, "ts": time.time(), **extra}
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis.from_url(redis_url)
+        _publisher.publish(run_channel(run_id), json.dumps(event, default=str))
+    except Exception as e:
+        logger.warning(f"Could not publish progress event for {run_id}: {e}")
+
+
+def _subscriber() -> "aioredis.Redis":
+    loop = asyncio.get_running_loop()
+    client = _subscribers.get(loop)
+    if client is None:
+        client = _subscribers[loop] = aioredis.Redis.from_url(redis_url)
+    return client
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """One SSE frame; the event name is the run status so clients can listen per status."""
+    return f"event: {event.get('status', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class RunEventSubscription:
+    """Async context manager over the pub/sub channel of one run.
+
+    Subscribe first, then read the current job snapshot: every update
+    published after the snapshot is then guaranteed to be received.
+    """
+
+    def __init__(self, run_id: str):
+        self.channel = run_channel(run_id)
+        self._pubsub: Any = None
+
+    async def __aenter__(self) -> "RunEventSubscription":
+        self._pubsub = _subscriber().pubsub()
+        try:
+            await self._pubsub.subscribe(self.channel)
+        except BaseException:
+            await self._pubsub.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        # Returns the pub/sub connection to the shared pool; the client stays open
+        try:
+            await self._pubsub.unsubscribe(self.channel)
+        finally:
+            await self._pubsub.aclose()
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event on the channel, or None if nothing arrived within ``timeout`` seconds."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            if message is None:
+                continue
+            try:
+                return json.loads(message["data"])
+            except (TypeError, ValueError):
+                logger.warning(f"Ignoring malformed run event on {self.channel}")
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+import json
+import random
+import threading
+import time
+
+from loguru import logger
+
+from .config import MOCK_LATENCY_MODES, settings
+
+
+SIMULATION_MODES = MOCK_LATENCY_MODES
+
+
+class SimulationEngine:
+	"""Stand-in for agent think time in mock mode.
+
+	Only the pauses are simulated; database tools and RAG lookups still run
+	for real. Modes:
+
+	- ``zero``: no pauses, for driving load through the API/Celery/DB layers
+	- ``fixed``: each step sleeps its default duration, or ``fixed_seconds`` when set
+	- ``sampled``: durations are drawn from a recorded profile, a JSON object
+	  mapping step name (or ``"*"`` for any step) to a list of observed seconds
+	"""
+
+	def __init__(
+		self,
+		mode: str = "zero",
+		fixed_seconds: Optional[float] = None,
+		profile: Optional[Dict[str, List[float]]] = None,
+		seed: Optional[int] = None,
+	) -> None:
+		if mode not in SIMULATION_MODES:
+			raise ValueError(f"Unknown simulation mode {mode!r}; expected one of {', '.join(SIMULATION_MODES)}")
+		if mode == "sampled" and not profile:
+			raise ValueError("Sampled simulation mode requires a latency profile")
+		self.mode = mode
+		self.fixed_seconds = fixed_seconds
+		self.profile = {step: [float(v) for v in values] for step, values in (profile or {}).items() if values}
+		self._rng = random.Random(seed)
+		self._lock = threading.Lock()
+
+	def delay_for(self, step: str, default: float) -> float:
+		if self.mode == "zero":
+			return 0.0
+		if self.mode == "fixed":
+			return default if self.fixed_seconds is None else self.fixed_seconds
+		samples = self.profile.get(step) or self.profile.get("*")
+		if not samples:
+			return default
+		with self._lock:
+			return self._rng.choice(samples)
+
+	def pause(self, step: str, default: float) -> float:
+		"""Sleep for the simulated duration of ``step`` and return it."""
+		seconds = max(0.0, self.delay_for(step, default))
+		if seconds:
+			time.sleep(seconds)
+		return seconds
+
+
+def load_latency_profile(path: str) -> Dict[str, List[float]]:
+	"""Read a recorded latency profile; a bare list applies to every step."""
+	with open(path, "r", encoding="utf-8") as f:
+		data = json.load(f)
+	if isinstance(data, list):
+		return {"*": data}
+	return data
+
+
+_engine: Optional[SimulationEngine] = None
+
+
+def get_simulation_engine() -> SimulationEngine:
+	global _engine
+	if _engine is None:
+		profile = load_latency_profile(settings.mock_latency_profile) if settings.mock_latency_profile else None
+		_engine = SimulationEngine(
+			mode=settings.mock_latency_mode,
+			fixed_seconds=settings.mock_latency_seconds,
+			profile=profile,
+			seed=settings.mock_latency_seed,
+		)
+		logger.info(f"🎭 Mock simulation engine: mode={_engine.mode}")
+	return _engine
+
+
+def set_simulation_engine(engine: Optional[SimulationEngine]) -> None:
+	"""Swap the process-wide engine (e.g. zero latency for a load test); None re-reads settings."""
+	global _engine
+	_engine = engine
@@ -4,6 +4,7 @@ import React, { useState } from "react";
 import type { Job } from "@/types/job";
 import { Button } from "./ui/button";
 import { Modal } from "./ui/modal";
+import runService from "@/services/runService";
 
 type Props = {
   job: Job;
@@ -17,6 +18,22 @@ type Props = {
 export function JobRow({ job, onRefresh }: Props) {
   const [showResultsModal, setShowResultsModal] = useState(false);
   const [showErrorModal, setShowErrorModal] = useState(false);
+  // Job listings carry summaries only; the full result is fetched on demand
+  const [fetchedResult, setFetchedResult] = useState<any>(null);
+  const result = job.result ?? fetchedResult;
+
+  const openResults = async () => {
+    if (!result) {
+      try {
+        const full = await runService.getRun(job.run_id);
+        setFetchedResult(full.result ?? null);
+      } catch (err) {
+        console.error(`Error loading results for ${job.run_id}:`, err);
+        return;
+      }
+    }
+    setShowResultsModal(true);
+  };
 
   // Format timestamp
   const formatTimestamp = (timestamp?: string | null) => {
@@ -42,25 +59,25 @@ export function JobRow({ job, onRefresh }: Props) {
 
   // Extract crew output from job result, fallback to escalation_summary
   const getCrewOutput = () => {
-    if (!job.result || typeof job.result !== "object") {
+    if (!result || typeof result !== "object") {
       return null;
     }
 
     // Try crew_output first, then fallback to escalation_summary
-    return job.result.crew_output || job.result.escalation_summary || null;
+    return result.crew_output || result.escalation_summary || null;
   };
 
   // Check if there's incident information
   const getIncidentInfo = () => {
-    if (!job.result || typeof job.result !== "object") {
+    if (!result || typeof result !== "object") {
       return null;
     }
 
     return {
-      incident_id: job.result.incident_id,
-      ticket_priority: job.result.ticket_priority,
-      contact_information: job.result.contact_information,
-      incident_analysis: job.result.incident_analysis,
+      incident_id: result.incident_id,
+      ticket_priority: result.ticket_priority,
+      contact_information: result.contact_information,
+      incident_analysis: result.incident_analysis,
     };
   };
 
@@ -113,11 +130,11 @@ export function JobRow({ job, onRefresh }: Props) {
             <Button size="sm" variant="outline" onClick={onRefresh}>
               🔄
             </Button>
-            {job.result && (
+            {(result || job.status === "success") && (
               <Button
                 size="sm"
                 variant="outline"
-                onClick={() => setShowResultsModal(true)}
+                onClick={openResults}
               >
                 📄 Results
               </Button>
@@ -284,7 +301,7 @@ export function JobRow({ job, onRefresh }: Props) {
             <h3 className="font-semibold mb-3">📊 Complete Result Data</h3>
             <div className="bg-gray-50 dark:bg-gray-800/50 rounded-lg p-4 overflow-auto max-h-96">
               <pre className="text-sm whitespace-pre-wrap text-gray-900 dark:text-gray-100">
-                {JSON.stringify(job.result, null, 2)}
+                {JSON.stringify(result, null, 2)}
               </pre>
             </div>
           </div>
@@ -0,0 +1,123 @@
+"""
+Benchmark the single-pass smart_chunk against the previous multi-pass implementation.
+
+Usage (from the repo root):
+    python scripts/benchmark_chunking.py [path] [--repeat N]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.rag_chunking import ENC, count_tokens, normalize_whitespace, smart_chunk
+
+
+def legacy_smart_chunk(text: str, max_tokens: int = 400, overlap_tokens: int = 60) -> List[str]:
+    """The previous implementation, kept verbatim for comparison."""
+    text = normalize_whitespace(text)
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    def flush() -> None:
+        nonlocal current, current_tokens
+        if not current:
+            return
+        joined = "\n".join(current).strip()
+        if joined:
+            chunks.append(joined)
+        current = []
+        current_tokens = 0
+
+    for para in paragraphs:
+        para_tokens = count_tokens(para)
+        if para_tokens > max_tokens:
+            sentences = re.split(r"(?<=[.!?])\s+", para)
+            for sent in sentences:
+                sent = sent.strip()
+                if not sent:
+                    continue
+                ts = count_tokens(sent)
+                if current_tokens + ts > max_tokens:
+                    flush()
+                current.append(sent)
+                current_tokens += ts
+            else:
+                if current_tokens + para_tokens > max_tokens:
+                    flush()
+                current.append(para)
+                current_tokens += para_tokens
+
+    flush()
+
+    if overlap_tokens > 0 and chunks:
+        overlapped: List[str] = []
+        prev_tail = ""
+        for ch in chunks:
+            if prev_tail:
+                overlapped.append((prev_tail + "\n" + ch).strip())
+            else:
+                overlapped.append(ch)
+            if ENC is None:
+                words = ch.split()
+                prev_tail = " ".join(words[-overlap_tokens:]) if words else ""
+            else:
+                ids = ENC.encode(ch)
+                prev_tail = ENC.decode(ids[-overlap_tokens:])
+        return overlapped
+
+    return chunks
+
+
+def bench(fn, text: str, repeat: int, max_tokens: int, overlap_tokens: int):
+    best = float("inf")
+    chunks: List[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = fn(text, max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+        best = min(best, time.perf_counter() - start)
+    return best, chunks
+
+
+def describe(name: str, seconds: float, chunks: List[str], source_tokens: int) -> None:
+    sizes = [count_tokens(c) for c in chunks]
+    print(f"{name:<12} {seconds * 1000:9.1f} ms  chunks={len(chunks):4d}  "
+          f"max_tokens={max(sizes) if sizes else 0:4d}  total_tokens={sum(sizes):6d}  "
+          f"({sum(sizes) / max(1, source_tokens):.0%} of source)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default="data/parsed_knowledge_base.txt")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-tokens", type=int, default=400)
+    parser.add_argument("--overlap-tokens", type=int, default=60)
+    args = parser.parse_args()
+
+    with open(args.path, "r", encoding="utf-8") as f:
+        text = f.read()
+    source_tokens = count_tokens(normalize_whitespace(text))
+
+    print(f"📄 {args.path}: {len(text)} chars, {source_tokens} tokens "
+          f"(tokenizer: {'tiktoken cl100k_base' if ENC is not None else 'whitespace fallback'})")
+    print(f"⚙️  max_tokens={args.max_tokens} overlap_tokens={args.overlap_tokens} best of {args.repeat}")
+
+    legacy_s, legacy_chunks = bench(legacy_smart_chunk, text, args.repeat, args.max_tokens, args.overlap_tokens)
+    new_s, new_chunks = bench(smart_chunk, text, args.repeat, args.max_tokens, args.overlap_tokens)
+
+    describe("legacy", legacy_s, legacy_chunks, source_tokens)
+    describe("single-pass", new_s, new_chunks, source_tokens)
+    print(f"🚀 Speedup: {legacy_s / max(new_s, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
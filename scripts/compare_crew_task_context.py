@@ -0,0 +1,81 @@
+"""
+Check that every Imperial Court task receives the same upstream outputs whether
+phases 2A-2C run in parallel (CREW_PARALLEL_SPECIALISTS=true) or sequentially.
+
+The one intended difference: in parallel mode phases 2B and 2C see only the
+Phase 1 dossier (their stated prerequisite), not the sibling specialist
+outputs that precede them sequentially.
+
+Replays CrewAI's sequential process (Crew._execute_tasks in crewai 0.203) with
+canned task outputs instead of LLM calls, and compares the context string each
+task would be prompted with. Exits non-zero on any difference.
+
+Usage (from the repo root):
+    python scripts/compare_crew_task_context.py
+"""
+
+import os
+import sys
+from typing import Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crewai import Crew
+from crewai.tasks.task_output import TaskOutput
+
+from app.orchestrator import _build_court_tasks
+
+AGENT_NAMES = (
+    "intelligence", "technical", "business", "communication", "secretariat_strategy",
+    "secretariat_review", "emperor", "solution", "escalation",
+)
+# Specialists that run concurrently and therefore only see the intelligence dossier
+CONCURRENT_SPECIALISTS = ("business", "communication")
+INCIDENT = "Container CMAU0000020 showing duplicate processing entries in PORTNET system"
+
+
+def resolve_contexts(parallel: bool) -> Dict[str, str]:
+    """Context string handed to each task, following Crew._execute_tasks step by step."""
+    tasks = _build_court_tasks({name: None for name in AGENT_NAMES}, INCIDENT, parallel)
+    contexts: Dict[str, str] = {}
+    task_outputs = []
+    futures = []
+    for name, task in tasks.items():
+        output = TaskOutput(description=name, raw=f"<output of {name}>", agent=name)
+        if task.async_execution:
+            # No replay, so CrewAI's last_sync_output is None here
+            contexts[name] = Crew._get_context(None, task, [])
+            futures.append(output)
+        else:
+            if futures:
+                # Joining async tasks replaces the running outputs with theirs only
+                task_outputs = list(futures)
+                futures.clear()
+            contexts[name] = Crew._get_context(None, task, task_outputs)
+            task_outputs.append(output)
+        task.output = output
+    return contexts
+
+
+def main() -> int:
+    sequential = resolve_contexts(parallel=False)
+    parallel = resolve_contexts(parallel=True)
+    mismatches = 0
+    for name, expected in sequential.items():
+        note = ""
+        if name in CONCURRENT_SPECIALISTS:
+            expected = sequential["technical"]
+            note = " (intelligence dossier only, by design)"
+        same = parallel[name] == expected
+        mismatches += not same
+        upstream = parallel[name].count("<output of")
+        print(f"{'✅' if same else '❌'} {name:<14} {upstream} upstream outputs{note}")
+        if not same:
+            print(f"   sequential: {expected!r}")
+            print(f"   parallel:   {parallel[name]!r}")
+    print(f"\n{'All task contexts match' if not mismatches else f'{mismatches} task contexts differ'}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())